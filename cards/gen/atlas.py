@@ -0,0 +1,10 @@
+import os, sys
+
+# packs all card pngs of the parent folder into atlas.png and atlas.json, run from this folder
+sys.path.insert(0, os.path.join("..", ".."))
+from uno.components.cardatlas import CardAtlas
+
+atlas = CardAtlas.build("..")
+atlas.write("..")
+
+print(f"{len(atlas.rects)} cards, atlas size {atlas.image.shape[1]}x{atlas.image.shape[0]}")
@@ -0,0 +1,23 @@
+import os, sys
+
+# prebakes the rotated card backs of all card stacks into ../bundle.npz, run from this folder after atlas.py
+sys.path.insert(0, os.path.join("..", ".."))
+from pygame import init as pygame_init
+pygame_init() # the fonts in constants need an initialized pygame
+
+from uno.constants import CARD_SCALE_FACTOR, CARD_BUNDLE_MAX_PLAYERS
+from uno.components.cards import Cards
+from uno.components.cardatlas import CardAtlas
+from uno.components.cardbundle import CardBundle
+
+cards = Cards(opencv_mode=True, scale_factor=CARD_SCALE_FACTOR, atlas=CardAtlas.load(".."), use_bundle=False)
+
+images = {}
+for pcount in range(2, CARD_BUNDLE_MAX_PLAYERS + 1):
+    for pnum in range(1, pcount + 1):
+        rotation = Cards.get_stack_rotation(pnum, pcount)
+        images[cards.get_card_key("back", rotation)] = cards.raster_playing_card("back", rotation)
+
+CardBundle.write("..", images)
+
+print(f"{len(images)} cards, bundle size {os.path.getsize(os.path.join('..', CardBundle.file_name))//1024} KiB")
@@ -1,11 +1,16 @@
-from uno.uno import Uno
+from uno.platforms import enable_headless
 from argparse import ArgumentParser
 
 if __name__ == "__main__":
     parser = ArgumentParser()
     parser.add_argument("--fullscreen", help="Enable fullscreen mode", action="store_true")
+    parser.add_argument("--headless", help="Run without a display using SDL's dummy drivers", action="store_true")
     args = parser.parse_args()
     fullscreen = False
     if args.fullscreen:
         fullscreen = True
+    if args.headless:
+        enable_headless()
+    
+    from uno.uno import Uno
     Uno(fullscreen).main_loop()
\ No newline at end of file
@@ -1,2 +1,7 @@
+import sys
+from .platforms import enable_headless
+if "--headless" in sys.argv:
+    enable_headless() # before pygame gets initialized by importing uno.uno
+
 from .uno import Uno
 Uno().main_loop()
\ No newline at end of file
@@ -0,0 +1,95 @@
+from __future__ import annotations
+from collections import OrderedDict
+from os.path import join
+from threading import Thread, Lock
+
+from pygame import Surface
+from pygame.image import load as load_image
+from pygame.transform import scale
+
+
+class AssetCache:
+    """
+    Cache of decoded and scaled images from the assets folder
+    Entries are keyed by (name, rescale) and evicted least recently used first once more than max_entries are cached.
+    Images can be preloaded on a background thread, they are decoded and scaled there and
+    converted to the display format on the main thread when they are requested for the first time.
+    The returned surfaces are shared, callers must not draw onto them.
+    """
+    def __init__(self, assets_dir : str, max_entries : int = 64) -> None:
+        self.assets_dir = assets_dir
+        self.max_entries = max_entries
+        self.entries : OrderedDict[tuple, list] = OrderedDict() # (name, rescale) -> [surface, converted]
+        self.lock = Lock()
+        self.preload_thread = None
+        self.hits = 0
+        self.misses = 0
+
+    def get_image(self, name : str, rescale : float = None) -> Surface:
+        """
+        Returns an image, loading it only if it isn't cached
+        :param name: file name in the assets folder
+        :param rescale: rescale the image by this factor
+        """
+        key = (name, rescale)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+
+        if entry is None:
+            self.misses += 1
+            entry = [self._load(name, rescale), False]
+            self._put(key, entry)
+        else:
+            self.hits += 1
+
+        if not entry[1]:
+            # converting needs the display, so it's done on the main thread
+            entry[0] = entry[0].convert_alpha()
+            entry[1] = True
+        return entry[0]
+
+    def preload(self, assets : list[tuple]) -> None:
+        """
+        Load images on a background thread
+        :param assets: list of (name, rescale)
+        """
+        if self.preload_thread is not None and self.preload_thread.is_alive():
+            return
+        self.preload_thread = Thread(target=self._preload, args=(list(assets),), name="AssetPreload", daemon=True)
+        self.preload_thread.start()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def get_counters(self) -> dict:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+    #########################################################################################
+
+    def _load(self, name : str, rescale : float = None) -> Surface:
+        img = load_image(join(self.assets_dir, name))
+        if not rescale is None:
+            imsize = img.get_size()
+            img = scale(img, (int(imsize[0]*rescale), int(imsize[1]*rescale)))
+        return img
+
+    def _put(self, key : tuple, entry : list) -> None:
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last = False)
+
+    def _preload(self, assets : list[tuple]) -> None:
+        for (name, rescale) in assets:
+            key = (name, rescale)
+            with self.lock:
+                if key in self.entries:
+                    continue
+            try:
+                self._put(key, [self._load(name, rescale), False])
+            except Exception as e:
+                print(f"Error preloading asset '{name}': {e}")
@@ -0,0 +1,287 @@
+"""
+Benchmarks and equivalence checks, run with `python -m uno.bench`
+Exits with 1 if a check fails, `--check` only runs the checks.
+"""
+from __future__ import annotations
+import json, os, subprocess, sys
+from argparse import ArgumentParser
+from os.path import dirname, realpath
+from time import perf_counter
+from tabulate import tabulate
+import numpy as np
+from random import Random
+
+from pygame import init as pygame_init
+from pygame.font import SysFont
+from pygame.surfarray import array3d, array_alpha
+pygame_init() # the fonts in constants need an initialized pygame
+
+from .components.cards import Cards
+from .constants import FONT_SM, FONT_MD, FONT_L, FONT_LG, FONT_XL, FONT_MONOSP_SM, FONT_MONOSP, FONT_MONOSP_LARGE
+from .fontregistry import FontRegistry
+from .historyindex import HistoryIndex
+
+CARD_ROTATIONS = [-90, -60, -30, -10, 0, 10, 30, 60, 90]
+STARTUP_BUDGET_MS = 750 # time from the first import to the first frame of the menu
+STARTUP_LAZY_MODULES = ["matplotlib", "PIL", "cv2", "tabulate"] # must not be imported before the first frame (numpy is imported by pygame)
+STARTUP_SCRIPT = """
+from time import perf_counter
+t = perf_counter()
+import json, sys
+from pygame.display import update
+from uno.uno import Uno
+u = Uno()
+u.loop([])
+u.get_screen(u.state).loop([])
+update()
+print(json.dumps({"first_frame_ms": (perf_counter() - t) * 1000, "modules": [m for m in %r if m in sys.modules]}))
+"""
+FONT_LOOKUPS = [(name, 1080//divisor) for (name, divisor) in [FONT_SM, FONT_MD, FONT_L, FONT_LG, FONT_XL, FONT_MONOSP_SM, FONT_MONOSP, FONT_MONOSP_LARGE]] # the fonts in constants at 1080p
+SURFACE_CONVERTERS = {
+    "zero-copy": Cards._to_pygame_surface,
+    "v1 (tobytes)": Cards.convert_opencv_img_to_pygame_v1,
+    "v2 (make_surface)": Cards.convert_opencv_img_to_pygame_v2,
+    "v3 (cached surface)": Cards.convert_opencv_img_to_pygame_v3,
+}
+
+
+def check_card_engines(cards : list[str] = ["back", "wildplus4", "red_8"], rotations : list[int] = CARD_ROTATIONS, max_mean_diff : float = 2.0, max_diff_share : float = 0.02) -> list[list]:
+    """
+    Compare the homography engine to the multipass pipeline pixel by pixel
+    The engines resample a different number of times, so only the mean difference and the share of pixels
+    that differ by more than 32 (mostly on the anti-aliased edges) are checked.
+    Returns one row (card, rotation, mean diff, share, ok) per image.
+    """
+    multipass = Cards(opencv_mode=True, engine="multipass", use_bundle=False)
+    homography = Cards(opencv_mode=True, engine="homography", use_bundle=False)
+    rows = []
+    for name in cards:
+        for r in rotations:
+            ref = multipass.raster_playing_card(name, r)
+            im = homography.raster_playing_card(name, r)
+            if ref.shape != im.shape:
+                rows.append([name, r, None, None, False])
+                continue
+            diff = np.abs(ref.astype(np.int16) - im.astype(np.int16))
+            mean_diff = float(diff.mean())
+            diff_share = float((diff > 32).mean())
+            rows.append([name, r, round(mean_diff, 3), round(diff_share, 4), mean_diff <= max_mean_diff and diff_share <= max_diff_share])
+    return rows
+
+
+def bench_card_engines(repeat : int = 20) -> dict:
+    """
+    Time the rasterization of rotated cards with both engines
+    Returns the milliseconds per card of each engine.
+    """
+    results = {}
+    for engine in ["multipass", "homography"]:
+        cards = Cards(opencv_mode=True, engine=engine, use_bundle=False)
+        cards.raster_playing_card("back", 0) # warm up
+        t = perf_counter()
+        for i in range(repeat):
+            for r in CARD_ROTATIONS:
+                cards.raster_playing_card("back", r)
+        results[engine] = (perf_counter() - t) * 1000 / (repeat * len(CARD_ROTATIONS))
+    return results
+
+
+def check_history_index(entries : int = 400, seed : int = 0) -> list[list]:
+    """
+    Compare the binary search queries of the history index to scanning the history
+    Actions share their time now and then, so ties at query times are covered. Half of the entries are undone
+    again and the queries are checked once more.
+    Returns one row (query, queries, wrong results) per query.
+    """
+    rng = Random(seed)
+    history = [] # (action, running total, time)
+    index = HistoryIndex()
+    cards = wins = time = 0
+    for i in range(entries):
+        time += rng.choice([0, 0, 1, 5, 20])
+        if rng.random() < 0.15:
+            wins += 1
+            history.append(("win", wins, time))
+        else:
+            cards += rng.randint(1, 4)
+            history.append(("draw", cards, time))
+        index.append(*history[-1])
+
+    def scan_at(action : str, t : int) -> int:
+        values = [v for (a, v, ht) in history if a == action and ht <= t]
+        return values[-1] if len(values) > 0 else 0
+    def scan_game(n : int) -> int:
+        win_times = [ht for (a, v, ht) in history if a == "win"]
+        if n < 1 or n > len(win_times) + 1:
+            return 0
+        start = 0 if n == 1 else scan_at("draw", win_times[n-2])
+        return scan_at("draw", win_times[n-1] if n <= len(win_times) else time) - start
+
+    counts = {"cards_at": [0, 0], "wins_at": [0, 0], "delta": [0, 0], "wins_between": [0, 0], "cards_in_game": [0, 0]}
+    def check(name : str, result : object, expected : object) -> None:
+        counts[name][0] += 1
+        counts[name][1] += result != expected
+
+    for undo in [False, True]:
+        if undo:
+            for i in range(entries//2):
+                history.pop()
+                index.pop()
+            time = history[-1][2]
+        times = sorted({ht for (a, v, ht) in history}) + [-1, time + 1]
+        for t in times:
+            check("cards_at", index.cards_at(t), scan_at("draw", t))
+            check("wins_at", index.wins_at(t), scan_at("win", t))
+            t2 = rng.choice(times)
+            check("delta", index.delta(t, t2), (scan_at("draw", t2) - scan_at("draw", t), scan_at("win", t2) - scan_at("win", t)))
+            check("wins_between", index.wins_between(t, t2), scan_at("win", t2) - scan_at("win", t))
+        for n in range(index.wins[-1] + 4):
+            check("cards_in_game", index.cards_in_game(n), scan_game(n))
+    return [[name, c[0], c[1]] for name, c in counts.items()]
+
+
+def check_surface_conversion() -> list[list]:
+    """
+    Check that the converters keep colors and alpha of BGRA images, including strided crops
+    Returns one row (converter, image, colors ok, alpha ok) per converter and image.
+    """
+    rng = np.random.default_rng(0)
+    full = rng.integers(0, 256, (61, 47, 4), dtype=np.uint8)
+    full[0, :, 3] = 0 # fully transparent and fully opaque rows
+    full[1, :, 3] = 255
+    images = {"contiguous": full, "crop": full[5:40, 3:30], "card": Cards(opencv_mode=True).raster_playing_card("back", 30)}
+
+    rows = []
+    for name, convert in SURFACE_CONVERTERS.items():
+        for imname, im in images.items():
+            surface = convert(im)
+            colors_ok = surface.get_size() == im.shape[1::-1] and np.array_equal(array3d(surface).swapaxes(0, 1), im[:, :, 2::-1])
+            alpha_ok = np.array_equal(array_alpha(surface).swapaxes(0, 1), im[:, :, 3])
+            rows.append([name, imname, colors_ok, alpha_ok])
+    return rows
+
+
+def bench_surface_conversion(repeat : int = 200) -> dict:
+    """
+    Time the OpenCV to pygame conversion of a rotated card with each converter
+    Returns the microseconds per conversion of each converter.
+    """
+    im = Cards(opencv_mode=True).raster_playing_card("back", 30)
+    results = {}
+    for name, convert in SURFACE_CONVERTERS.items():
+        convert(im) # warm up
+        t = perf_counter()
+        for i in range(repeat):
+            convert(im)
+        results[name] = (perf_counter() - t) * 1_000_000 / repeat
+    return results
+
+
+def bench_font_lookup(repeat : int = 20) -> dict:
+    """
+    Time looking up the fonts used by the screens
+    "SysFont" creates every font with SysFont like the screens did on each resize, "registry cold" uses a new
+    font registry each time, so names are resolved and fonts created, "registry warm" only hits its cache.
+    Returns the microseconds per font lookup of each method.
+    """
+    SysFont(*FONT_LOOKUPS[0]) # the system font list is scanned once per process
+    methods = {
+        "SysFont": lambda: [SysFont(name, size) for (name, size) in FONT_LOOKUPS],
+        "registry cold": lambda: [FontRegistry().get(name, size) for (name, size) in FONT_LOOKUPS],
+    }
+    fonts = FontRegistry()
+    methods["registry warm"] = lambda: [fonts.get(name, size) for (name, size) in FONT_LOOKUPS]
+
+    results = {}
+    for name, lookup in methods.items():
+        lookup() # warm up
+        t = perf_counter()
+        for i in range(repeat):
+            lookup()
+        results[name] = (perf_counter() - t) * 1_000_000 / (repeat * len(FONT_LOOKUPS))
+    return results
+
+
+def bench_startup(budget_ms : float = STARTUP_BUDGET_MS) -> dict:
+    """
+    Start the app with `python -X importtime` in a new interpreter and time the first frame of the menu
+    Returns the time to the first frame, the slowest top level imports, the lazy modules that were imported
+    too early and whether the budget was kept.
+    """
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT % STARTUP_LAZY_MODULES], cwd=dirname(dirname(realpath(__file__))), env=env, capture_output=True, text=True)
+    if p.returncode != 0:
+        raise RuntimeError(f"startup failed: {p.stderr.splitlines()[-1] if p.stderr else p.returncode}")
+    result = json.loads(p.stdout.splitlines()[-1])
+
+    # lines look like "import time:  self [us] | cumulative | imported package", nested imports are indented
+    imports = []
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("imported package"):
+            continue
+        (_, cumulative, name) = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            imports.append((name.strip(), int(cumulative) / 1000))
+    
+    return {
+        "first_frame_ms": result["first_frame_ms"],
+        "import_ms": sum(ms for (name, ms) in imports),
+        "slowest_imports": sorted(imports, key=lambda x: x[1], reverse=True)[:10],
+        "early_modules": result["modules"],
+        "ok": result["first_frame_ms"] <= budget_ms and len(result["modules"]) == 0,
+    }
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmarks and equivalence checks")
+    parser.add_argument("--check", help="Only run the equivalence checks, exits with 1 if one fails", action="store_true")
+    args = parser.parse_args()
+    failed = []
+
+    rows = check_card_engines()
+    print(tabulate(rows, headers=["Card", "Rotation", "Mean diff", "Diff > 32", "Ok"]))
+    failed += [f"card engines: {r[0]} at {r[1]} degrees differs from the multipass pipeline" for r in rows if not r[4]]
+    print()
+    if not args.check:
+        results = bench_card_engines()
+        print(tabulate([[k, round(v, 3)] for k, v in results.items()], headers=["Engine", "ms per card"]))
+        print(f"speedup: {results['multipass'] / results['homography']:.1f}x")
+        print()
+    index_rows = check_history_index()
+    print(tabulate(index_rows, headers=["History index", "Queries", "Wrong"]))
+    print()
+    failed += [f"history index: {r[2]} of {r[1]} {r[0]} queries differ from scanning the history" for r in index_rows if r[2] > 0]
+    conversion_rows = check_surface_conversion()
+    print(tabulate(conversion_rows, headers=["Converter", "Image", "Colors ok", "Alpha ok"]))
+    print()
+    # only the converter in use has to keep alpha, the older ones are kept for the timings
+    for (name, imname, colors_ok, alpha_ok) in conversion_rows:
+        if name == "zero-copy" and not colors_ok:
+            failed.append(f"surface conversion: {name} changes the colors of the {imname} image")
+        if name == "zero-copy" and not alpha_ok:
+            failed.append(f"surface conversion: {name} changes the alpha of the {imname} image")
+    
+    if not args.check:
+        results = bench_surface_conversion()
+        print(tabulate([[k, round(v, 1)] for k, v in results.items()], headers=["Converter", "us per card"]))
+        print()
+        results = bench_font_lookup()
+        print(tabulate([[k, round(v, 1)] for k, v in results.items()], headers=["Font lookup", "us per font"]))
+        
+        print()
+        startup = bench_startup()
+        print(tabulate([[name, round(ms, 1)] for (name, ms) in startup["slowest_imports"]], headers=["Import", "ms"]))
+        print(f"first frame after {startup['first_frame_ms']:.0f} ms (budget {STARTUP_BUDGET_MS} ms), imports took {startup['import_ms']:.0f} ms")
+        if len(startup["early_modules"]) > 0:
+            print(f"imported before the first frame: {', '.join(startup['early_modules'])}")
+        if not startup["ok"]:
+            failed.append("startup: over budget or lazy modules imported before the first frame")
+    
+    if len(failed) > 0:
+        print()
+        print("failed:")
+        for f in failed:
+            print(f"  {f}")
+        raise SystemExit(1)
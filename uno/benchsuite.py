@@ -0,0 +1,222 @@
+"""
+Benchmark suite for savegames, screens and rendering, run with `python -m uno.benchsuite`
+Every benchmark runs for each player count and history size, the results are written to a json file
+that can be compared to the results of an other commit with --compare.
+The app runs headless in a temporary folder, savegames of the user are not touched.
+"""
+from __future__ import annotations
+import json, os, platform, subprocess, sys, tempfile
+from contextlib import redirect_stdout
+from argparse import ArgumentParser
+from datetime import datetime
+from os.path import abspath, dirname, realpath
+from time import perf_counter
+
+from .platforms import enable_headless
+enable_headless() # before pygame gets initialized by importing uno.uno
+
+import pygame
+from tabulate import tabulate
+
+from .uno import Uno
+from .components.cards import Cards
+from .constants import CARD_SCALE_FACTOR
+from .savegen import SaveGenerator
+
+PLAYER_COUNTS = list(range(2, 9)) # every player count the game supports
+HISTORY_SIZES = [10**2, 10**3, 10**4, 10**5, 10**6] # history entries of all players together
+QUICK_HISTORY_SIZES = [10**2, 10**3, 10**4]
+SAVE_VERSIONS = [0, 1, 2]
+MIN_TIME = 0.5 # seconds each benchmark is repeated for
+MAX_REPEAT = 20
+UNDO_COUNT = 100
+
+
+def write_savegame(filename : str, game : dict) -> None:
+    os.makedirs("saves", exist_ok=True)
+    with open(f"saves/{filename}", "w") as f:
+        f.write(json.dumps(game))
+
+
+def measure(func : function, setup : function = None, repeat : int = None) -> dict:
+    """
+    Call a function until MIN_TIME has passed, at most MAX_REPEAT times
+    Returns the mean, min and max time of a call in milliseconds and the number of calls.
+    :param func: function to time
+    :param setup: called untimed before each call
+    :param repeat: exact number of calls
+    """
+    times = []
+    total = 0
+    while (repeat is None and (total < MIN_TIME or len(times) == 0) and len(times) < MAX_REPEAT) or (repeat is not None and len(times) < repeat):
+        if setup is not None:
+            setup()
+        t = perf_counter()
+        func()
+        times.append(perf_counter() - t)
+        total += times[-1]
+    return {"mean_ms": sum(times) / len(times) * 1000, "min_ms": min(times) * 1000, "max_ms": max(times) * 1000, "repeat": len(times)}
+
+
+def bench_case(u : Uno, pcount : int, history : int) -> list[dict]:
+    """
+    Run every benchmark for one player count and history size in an empty working directory
+    """
+    results = []
+    def add(name : str, result : dict, **params) -> None:
+        results.append({"name": name, "players": pcount, "history": history, **params, **result})
+
+    u.save_cache.clear()
+    u.save_manifest = None
+    names = [f"Player {i}" for i in range(1, pcount+1)]
+    for version in SAVE_VERSIONS:
+        write_savegame(f"bench_v{version}.json", SaveGenerator(seed=0).make_savegame(version, names, history, journaled=True)) # version 2 like the app writes it
+
+    # loading includes the conversion of older save versions and building the game screen
+    for version in SAVE_VERSIONS:
+        add("load", measure(lambda: u.load(f"bench_v{version}.json"), setup=u.save_writer.flush), version=version)
+    u.load("bench_v2.json")
+
+    add("save", measure(lambda: (u.save(), u.save_writer.flush())))
+
+    count = min(UNDO_COUNT, history)
+    def undo_all() -> None:
+        for i in range(count):
+            u.undo()
+        u.save_writer.flush()
+    def redo_all() -> None:
+        for i in range(count):
+            u.redo()
+        u.save_writer.flush()
+    r = measure(undo_all, repeat=1)
+    redo_all()
+    add("undo", {k: v / count if k.endswith("_ms") else count for k, v in r.items()})
+
+    def full_frame() -> None:
+        u.invalidate()
+        u.run_frame([])
+    add("game frame", measure(full_frame))
+    add("game frame idle", measure(lambda: u.run_frame([])))
+
+    stats = u.get_screen(3)
+    add("stats setup", measure(stats.setup))
+
+    def reset_manifest() -> None:
+        u.save_cache.clear()
+        u.save_manifest = None
+        if os.path.isfile("saves_manifest.json"):
+            os.remove("saves_manifest.json")
+    add("saves info cold", measure(u.get_saves_info, setup=reset_manifest))
+    add("saves info warm", measure(u.get_saves_info))
+
+    global_stats = u.get_screen(4)
+    add("globalstats setup", measure(global_stats.setup))
+    for i, page in enumerate(global_stats._button_names[1:]):
+        add("globalstats page", measure(lambda: global_stats._display_page(i)), page=page)
+
+    u.setstate(0)
+    return results
+
+
+def bench_raster(pcount : int) -> dict:
+    """
+    Time rasterizing the card stacks of a game without any card cache
+    Returns the milliseconds per card.
+    """
+    cards = Cards(scale_factor=CARD_SCALE_FACTOR, use_bundle=False)
+    rotations = [Cards.get_stack_rotation(p, pcount) for p in range(1, pcount+1)]
+    r = measure(lambda: [cards.raster_playing_card("back", rot) for rot in rotations])
+    return {k: v / len(rotations) if k.endswith("_ms") else v for k, v in r.items()}
+
+
+def get_meta() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=dirname(realpath(__file__)), capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(player_counts : list[int], history_sizes : list[int]) -> dict:
+    """
+    Run the whole suite in a temporary folder
+    Returns the meta data and a list of results.
+    """
+    u = Uno()
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, redirect_stdout(sys.stderr): # keeps the messages of the app out of the results
+        try:
+            for pcount in player_counts:
+                os.chdir(tmp)
+                r = bench_raster(pcount)
+                results.append({"name": "raster card", "players": pcount, "history": None, **r})
+                for history in history_sizes:
+                    print(f"{pcount} players, {history} history entries")
+                    case_dir = os.path.join(tmp, f"{pcount}_{history}")
+                    os.mkdir(case_dir)
+                    os.chdir(case_dir)
+                    results.extend(bench_case(u, pcount, history))
+        finally:
+            u.save_writer.close()
+            os.chdir(cwd)
+    return {"meta": get_meta(), "results": results}
+
+
+def get_result_key(r : dict) -> tuple:
+    return (r["name"], r["players"], r["history"], r.get("version"), r.get("page"))
+
+
+def get_result_label(r : dict) -> str:
+    label = r["name"]
+    if "version" in r:
+        label += f" v{r['version']}"
+    if "page" in r:
+        label += f" {r['page']}"
+    return label
+
+
+def print_results(data : dict, compare : dict = None) -> None:
+    baseline = {}
+    if compare is not None:
+        baseline = {get_result_key(r): r for r in compare["results"]}
+    rows = []
+    for r in data["results"]:
+        row = [get_result_label(r), r["players"], r["history"], round(r["mean_ms"], 3), round(r["min_ms"], 3), r["repeat"]]
+        if compare is not None:
+            old = baseline.get(get_result_key(r))
+            row.append(None if old is None or old["mean_ms"] == 0 else round(r["mean_ms"] / old["mean_ms"], 2))
+        rows.append(row)
+    headers = ["Benchmark", "Players", "History", "Mean ms", "Min ms", "Runs"]
+    if compare is not None:
+        headers.append(f"vs {compare['meta']['commit'][:8]}")
+    print(tabulate(rows, headers=headers))
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark savegames, screens and rendering")
+    parser.add_argument("--players", help="Player counts", type=int, nargs="+", default=PLAYER_COUNTS)
+    parser.add_argument("--history", help="History sizes", type=int, nargs="+", default=HISTORY_SIZES)
+    parser.add_argument("--quick", help=f"Only history sizes up to {QUICK_HISTORY_SIZES[-1]}", action="store_true")
+    parser.add_argument("--out", help="Json file for the results", default="benchmark.json")
+    parser.add_argument("--compare", help="Json file of an earlier run to compare to")
+    args = parser.parse_args()
+
+    out = abspath(args.out) # the app changes the working directory
+    compare = None
+    if args.compare is not None:
+        with open(args.compare, "r") as f:
+            compare = json.loads(f.read())
+
+    data = run(args.players, QUICK_HISTORY_SIZES if args.quick else args.history)
+    with open(out, "w") as f:
+        f.write(json.dumps(data, indent=2))
+    print_results(data, compare)
+    print(f"results written to {out}")
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from pygame import Surface
+from pygame import Surface, Rect
 from pygame.locals import *
 from pygame.draw import rect
 from pygame.font import Font
@@ -13,15 +13,15 @@ if TYPE_CHECKING:
     from ..uno import Uno
     
 class Button:
-    def __init__(self, game : Uno, name : str, pos : tuple, size : tuple, handler : function, font : Font = FONT_XL, subtext : str = None, font_subtext : Font = FONT_MD, border_size : int = 5, color : tuple = WHITE, tag : str = None) -> None:
+    def __init__(self, game : Uno, name : str, pos : tuple, size : tuple, handler : function, font : Font = None, subtext : str = None, font_subtext : Font = None, border_size : int = 5, color : tuple = WHITE, tag : str = None) -> None:
         self.g = game
         self.name = name
         self.subtext = subtext
         self.pos = pos # (x, y)
         self.size = size # (w, h)
         self.handler = handler
-        self.font = font
-        self.font_subtext = FONT_MD
+        self.font = get_font(FONT_XL) if font is None else font
+        self.font_subtext = get_font(FONT_MD)
         self.border_size = border_size
         self.color = color
         self.tag = tag
@@ -40,7 +40,7 @@ class Button:
             return
 
         if not subtext is None and len(self.subtext) > 0:
-            self.font = FONT_LG
+            self.font = get_font(FONT_LG)
 
     def click(self, click_pos : tuple) -> bool:
         (cx, cy) = click_pos
@@ -54,6 +54,11 @@ class Button:
             return True
         return False
     
+    def get_rect(self) -> Rect:
+        (x, y) = self.pos
+        (w, h) = self.size
+        return Rect(x-w//2, y-h//2, w, h)
+    
     def mouse_event(self, event : Event) -> bool:
         if event.type == MOUSEBUTTONUP:
             return self.click(event.pos)
@@ -74,7 +79,7 @@ class Button:
             return
         
         if not self.subtext is None and len(self.subtext) > 0:
-            self.g.blit_aligned(self.font.render(self.name, True, self.color), (x, y - h//6), window)
-            self.g.blit_aligned(self.font_subtext.render(self.subtext, True, self.color), (x, y + h/6), window)
+            self.g.blit_aligned(self.g.render_text(self.font, self.name, self.color), (x, y - h//6), window)
+            self.g.blit_aligned(self.g.render_text(self.font_subtext, self.subtext, self.color), (x, y + h/6), window)
         else:
-            self.g.blit_aligned(self.font.render(self.name, True, self.color), (x, y), window)
\ No newline at end of file
+            self.g.blit_aligned(self.g.render_text(self.font, self.name, self.color), (x, y), window)
\ No newline at end of file
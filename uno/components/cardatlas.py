@@ -0,0 +1,138 @@
+from __future__ import annotations
+import json, hashlib, os
+import numpy as np
+from threading import Lock
+
+from pygame import Surface, Rect
+from pygame.image import frombuffer, load as load_image, tobytes
+
+
+class CardAtlas:
+    """
+    All card images of the deck in one image, decoded once per process
+    Loads cards/atlas.png with the card rectangles from cards/atlas.json (built by cards/gen/atlas.py).
+    Surfaces are loaded with pygame, OpenCV is only imported when a card is requested as numpy image
+    or there is no prebuilt atlas, in which case the single card pngs are read once and packed in memory.
+    Cards are served as read-only numpy views and subsurfaces of the atlas, they must not be modified.
+    """
+    version = 1
+    columns = 8
+
+    _shared = {} # path -> CardAtlas
+    _shared_lock = Lock()
+
+    def __init__(self, rects : dict[str, tuple], image : np.ndarray = None, image_file : str = None) -> None:
+        self.rects = rects # card name -> (x, y, w, h)
+        self.image = image
+        if self.image is not None:
+            self.image.flags.writeable = False
+        self.image_file = image_file # atlas png, for loading the image on demand
+        self.surface = None
+        self.source_hashes = {} # card name -> hash of its pixels
+        self.lock = Lock()
+
+    @staticmethod
+    def get_shared(path : str) -> CardAtlas:
+        """
+        Returns the atlas of a card folder, it is loaded on the first call and shared afterwards
+        :param path: folder with the card pngs
+        """
+        path = os.path.realpath(path)
+        with CardAtlas._shared_lock:
+            atlas = CardAtlas._shared.get(path)
+            if atlas is None:
+                atlas = CardAtlas.load(path)
+                CardAtlas._shared[path] = atlas
+            return atlas
+
+    @staticmethod
+    def load(path : str) -> CardAtlas:
+        """
+        Load the prebuilt atlas of a card folder, falls back to building it from the card pngs
+        The atlas image itself is read on first use.
+        """
+        image_file = os.path.join(path, "atlas.png")
+        try:
+            with open(os.path.join(path, "atlas.json"), "r") as f:
+                meta = json.loads(f.read())
+            if meta.get("version") == CardAtlas.version and os.path.isfile(image_file):
+                return CardAtlas({k: tuple(v) for k, v in meta["cards"].items()}, image_file=image_file)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading card atlas from '{path}': {e}")
+        return CardAtlas.build(path)
+
+    @staticmethod
+    def build(path : str) -> CardAtlas:
+        """
+        Pack the card pngs of a folder into a new atlas
+        """
+        import cv2
+        names = sorted(f[:-4] for f in os.listdir(path) if f.endswith(".png") and f != "atlas.png")
+        images = [cv2.imread(os.path.join(path, f"{name}.png"), cv2.IMREAD_UNCHANGED) for name in names]
+        cell_h = max(im.shape[0] for im in images)
+        cell_w = max(im.shape[1] for im in images)
+        rows = (len(images) + CardAtlas.columns - 1) // CardAtlas.columns
+        atlas = np.zeros((rows*cell_h, CardAtlas.columns*cell_w, 4), dtype=np.uint8)
+
+        rects = {}
+        for i, (name, im) in enumerate(zip(names, images)):
+            if im.shape[2] == 3:
+                im = cv2.cvtColor(im, cv2.COLOR_BGR2BGRA)
+            x = (i % CardAtlas.columns) * cell_w
+            y = (i // CardAtlas.columns) * cell_h
+            atlas[y:y+im.shape[0], x:x+im.shape[1]] = im
+            rects[name] = (x, y, im.shape[1], im.shape[0])
+        return CardAtlas(rects, image=atlas)
+
+    def write(self, path : str) -> None:
+        """
+        Write the atlas to atlas.png and atlas.json in a folder
+        """
+        import cv2
+        cv2.imwrite(os.path.join(path, "atlas.png"), self.get_atlas_image())
+        with open(os.path.join(path, "atlas.json"), "w") as f:
+            f.write(json.dumps({"version": CardAtlas.version, "cards": self.rects}))
+
+    def get_atlas_image(self) -> np.ndarray:
+        """
+        Returns the whole atlas in BGRA, decoding it with OpenCV on the first call
+        """
+        with self.lock:
+            if self.image is None:
+                import cv2
+                self.image = cv2.imread(self.image_file, cv2.IMREAD_UNCHANGED)
+                self.image.flags.writeable = False
+            return self.image
+
+    def get_image(self, name : str) -> np.ndarray:
+        """
+        Returns a read-only view of a card in BGRA
+        :param name: e.g. "red_0"
+        """
+        (x, y, w, h) = self.rects[name]
+        return self.get_atlas_image()[y:y+h, x:x+w]
+
+    def get_surface(self, name : str) -> Surface:
+        """
+        Returns a card as subsurface of the atlas, it must not be drawn onto
+        :param name: e.g. "red_0"
+        """
+        with self.lock:
+            if self.surface is None:
+                if self.image is None:
+                    self.surface = load_image(self.image_file)
+                else:
+                    self.surface = frombuffer(self.image, self.image.shape[1::-1], 'BGRA')
+        return self.surface.subsurface(Rect(self.rects[name]))
+
+    def get_source_hash(self, name : str) -> str:
+        """
+        Returns a hash of the BGRA pixels of a card, used for cache keys of images derived from it
+        """
+        h = self.source_hashes.get(name)
+        if h is None:
+            h = hashlib.sha1(tobytes(self.get_surface(name), 'BGRA')).hexdigest()
+            self.source_hashes[name] = h
+        return h
@@ -0,0 +1,78 @@
+from __future__ import annotations
+import json, os
+import numpy as np
+from threading import Lock
+
+
+class CardBundle:
+    """
+    Prebaked rotated cards, built by cards/gen/bundle.py
+    The images are stored in cards/bundle.npz under the same keys as in the card cache,
+    so stale images of changed cards or a changed pipeline are never used.
+    Loading the bundle only needs numpy, no OpenCV.
+    """
+    version = 1
+    file_name = "bundle.npz"
+
+    _shared = {} # path -> CardBundle or None
+    _shared_lock = Lock()
+
+    def __init__(self, data : np.lib.npyio.NpzFile) -> None:
+        self.data = data
+        self.keys = set(data.files)
+        self.images = {} # key -> decompressed image
+        self.lock = Lock()
+
+    @staticmethod
+    def get_shared(path : str) -> CardBundle:
+        """
+        Returns the bundle of a card folder, None if there is none
+        It is loaded on the first call and shared afterwards.
+        :param path: folder with the card pngs
+        """
+        path = os.path.realpath(path)
+        with CardBundle._shared_lock:
+            if not path in CardBundle._shared:
+                CardBundle._shared[path] = CardBundle.load(path)
+            return CardBundle._shared[path]
+
+    @staticmethod
+    def load(path : str) -> CardBundle:
+        """
+        Open the bundle of a card folder, returns None if it doesn't exist or has an other version
+        """
+        bundle_path = os.path.join(path, CardBundle.file_name)
+        if not os.path.isfile(bundle_path):
+            return None
+        try:
+            data = np.load(bundle_path, allow_pickle=False)
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != CardBundle.version:
+                return None
+            return CardBundle(data)
+        except Exception as e:
+            print(f"Error loading card bundle '{bundle_path}': {e}")
+            return None
+
+    @staticmethod
+    def write(path : str, images : dict[str, np.ndarray]) -> None:
+        """
+        Write a bundle to a card folder
+        :param images: card cache key -> image
+        """
+        np.savez_compressed(os.path.join(path, CardBundle.file_name), meta=np.array(json.dumps({"version": CardBundle.version})), **images)
+
+    def get(self, key : str) -> np.ndarray:
+        """
+        Returns the prebaked image, None if it isn't in the bundle
+        :param key: card cache key, see CardCache.get_key
+        """
+        if not key in self.keys:
+            return None
+        with self.lock:
+            im = self.images.get(key)
+            if im is None:
+                im = self.data[key]
+                im.flags.writeable = False
+                self.images[key] = im
+            return im
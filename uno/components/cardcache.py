@@ -0,0 +1,72 @@
+from __future__ import annotations
+import hashlib, os
+from threading import get_ident
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class CardCache:
+    """
+    Content-addressed disk cache of rasterized cards
+    Files are named after a hash of everything that affects the finished bitmap, so changed source images
+    or a changed rasterization pipeline never hit stale entries. Bitmaps are stored as raw numpy arrays.
+    """
+    def __init__(self, path : str = "card_cache") -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(*parts : object) -> str:
+        """
+        Returns the cache key of a bitmap
+        :param parts: values the bitmap depends on, e.g. card name, rotation and the hash of its source image
+        """
+        return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+    def get(self, key : str) -> np.ndarray:
+        """
+        Returns the cached bitmap, None if it isn't cached
+        """
+        path = self._get_file_path(key)
+        if not os.path.isfile(path):
+            self.misses += 1
+            return None
+        try:
+            import numpy as np
+            im = np.load(path, allow_pickle=False)
+        except Exception as e:
+            print(f"Error loading cached card '{path}': {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return im
+
+    def put(self, key : str, im : np.ndarray) -> None:
+        """
+        Store a bitmap, errors are printed and otherwise ignored
+        """
+        path = self._get_file_path(key)
+        tmp_path = f"{path}.{get_ident()}.tmp" # cards can be rasterized on multiple threads
+        try:
+            import numpy as np
+            os.makedirs(self.path, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.save(f, im, allow_pickle=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error writing cached card '{path}': {e}")
+
+    def clear(self) -> None:
+        if not os.path.isdir(self.path):
+            return
+        for filename in os.listdir(self.path):
+            if filename.endswith(".npy"):
+                os.remove(os.path.join(self.path, filename))
+
+    #########################################################################################
+
+    def _get_file_path(self, key : str) -> str:
+        return os.path.join(self.path, f"{key}.npy")
@@ -1,5 +1,6 @@
-import cv2, math
-from cv2 import Mat
+from __future__ import annotations
+import math, os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from random import randint
 from ..constants import *
@@ -9,10 +10,18 @@ from pygame.surfarray import make_surface, blit_array
 from pygame import Surface
 from os.path import join, dirname, realpath
 
+from .cardcache import CardCache
+from .cardatlas import CardAtlas
+from .cardbundle import CardBundle
+
+# OpenCV is imported on demand, cards are usually served from the card bundle, the atlas or the card cache
+
 pygame_surface_cache = {}
 
 class Cards:
-    def __init__(self, opencv_mode : bool = False, scale_factor : float = 1.0) -> None:
+    pipeline_version = 1 # increase when changing the rasterization, invalidates the card cache
+
+    def __init__(self, opencv_mode : bool = False, scale_factor : float = 1.0, cache : CardCache = None, engine : str = CARD_RASTER_ENGINE, atlas : CardAtlas = None, use_bundle : bool = True) -> None:
         self.warp_matrix = Cards._calculate_warp_matrix([-0.60, 0.0, 0], (966, 968, 4)) # generate large warp matrix for card transformation
         self.h = 362
         self.w = 242
@@ -32,6 +41,10 @@ class Cards:
 
         self.image_path = join(dirname(realpath(__file__)), "../../cards")
         self.opencv_mode = opencv_mode
+        self.cache = cache
+        self.engine = engine # "homography" or "multipass"
+        self.atlas = CardAtlas.get_shared(self.image_path) if atlas is None else atlas
+        self.bundle = CardBundle.get_shared(self.image_path) if use_bundle else None
         self.debug = False
         #self.upscale = True
         
@@ -47,20 +60,130 @@ class Cards:
         col = randint(0, len(self.set_colors)-1)
         return f"{self.set_colors[col]}_{self.set_cards[num]}"
 
+    @staticmethod
+    def get_stack_rotation(pnum : int, pcount : int) -> float:
+        """
+        Returns the rotation of the card stack of a player, from 30 degrees for the first to -30 for the last one
+        """
+        return 30 - (60/(pcount - 1)*(pnum-1))
+
+    def get_card_key(self, name : str, rotation : int) -> str:
+        """
+        Returns the card cache and card bundle key of a rotated card
+        """
+        return CardCache.get_key(name, rotation, self.scale_factor, self.atlas.get_source_hash(name), Cards.pipeline_version, self.engine)
+
     def raster_playing_card(self, name : str, rotation : int = None) -> Surface:
         """
         name: e.g. "red_0"
         rotation: -90 - 90 degrees
+        Unrotated cards are shared with the card atlas and must not be modified
         """
-        im =  cv2.imread(f"{self.image_path}/{name}.png", cv2.IMREAD_UNCHANGED)
+        return self._convert_card(name, self._raster_card_image(name, rotation), rotation)
 
+    def raster_playing_cards(self, jobs : list[tuple], threads : int = CARD_RASTER_THREADS) -> list[Surface]:
+        """
+        Rasterize several cards at once, the OpenCV part runs on a thread pool
+        jobs: list of (name, rotation), see raster_playing_card
+        threads: size of the thread pool, 1 rasterizes the cards one after another
+        Returns the cards in the order of jobs
+        """
+        threads = min(threads, len(jobs), os.cpu_count() or 1)
+        if threads <= 1:
+            return [self.raster_playing_card(name, rotation) for (name, rotation) in jobs]
+        
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            images = list(pool.map(lambda job: self._raster_card_image(*job), jobs))
+        # surfaces are created on the calling thread
+        return [self._convert_card(name, im, rotation) for (im, (name, rotation)) in zip(images, jobs)]
+
+    def _convert_card(self, name : str, im : np.ndarray, rotation : int = None) -> Surface:
+        """
+        Convert a card image to the output format
+        """
+        if self.opencv_mode:
+            return im
         if rotation is None:
-            if self.opencv_mode:
-                return im
             if self.scale_factor != 1.0:
-                return rescale(Cards._to_pygame_surface(im), self.scale_factor)
-            return Cards._to_pygame_surface(im)
+                return rescale(self.atlas.get_surface(name), self.scale_factor)
+            return self.atlas.get_surface(name)
+        return Cards._to_pygame_surface(im)
+
+    def _raster_card_image(self, name : str, rotation : int = None) -> np.ndarray:
+        """
+        Returns the card as OpenCV image, safe to be called from multiple threads
+        Unrotated cards are None if not in opencv mode
+        """
+        if rotation is None:
+            return self.atlas.get_image(name) if self.opencv_mode else None # surfaces are taken from the atlas
+        
+        # rotated cards are expensive, look them up in the card bundle and the card cache first
+        key = self.get_card_key(name, rotation)
+        finalimg = None
+        if self.bundle is not None:
+            finalimg = self.bundle.get(key)
+        if finalimg is None and self.cache is not None:
+            finalimg = self.cache.get(key)
         
+        if finalimg is None:
+            finalimg = self._raster_rotated(self.atlas.get_image(name), rotation)
+            if self.cache is not None:
+                self.cache.put(key, finalimg)
+        return finalimg
+
+    def _raster_rotated(self, im : np.ndarray, rotation : int) -> np.ndarray:
+        """
+        Rotate a card image and tilt it back like a card lying on the table
+        """
+        if self.engine == "multipass":
+            return self._raster_rotated_multipass(im, rotation)
+        return self._raster_rotated_homography(im, rotation)
+
+    def _raster_rotated_homography(self, im : np.ndarray, rotation : int) -> np.ndarray:
+        """
+        Same result as _raster_rotated_multipass, but the source image is warped directly into the final image
+        """
+        import cv2
+        (matrix, size) = self._calculate_card_homography(im.shape, rotation)
+        return cv2.warpPerspective(im, matrix, size, flags=cv2.INTER_LINEAR)
+
+    def _calculate_card_homography(self, dim : tuple, rotation : int) -> tuple[np.ndarray, tuple]:
+        """
+        Compose the steps of _raster_rotated_multipass into one matrix
+        Returns the 3x3 matrix and the size (w, h) of the final image
+        """
+        import cv2
+        # put image in center of a canvas 4 times its size
+        bdim = (dim[0]*4, dim[1]*4)
+        place = Cards._calculate_translation_matrix(bdim[1]//2-dim[1]//2, bdim[0]//2-dim[0]//2)
+
+        # rotate 2d around the center of the canvas
+        rotate = np.vstack([cv2.getRotationMatrix2D((bdim[1]/2, bdim[0]/2), rotation, 1.0), [0, 0, 1]])
+
+        # crop top of image
+        crop_top = Cards._calculate_translation_matrix(0, -(bdim[0]//3))
+        cdim = (bdim[0] - bdim[0]//3, bdim[1])
+
+        # crop surrounding, after the 3d rotation
+        y = cdim[0]//3
+        x = cdim[1]//3
+        h = int(cdim[0]-y*2.5)
+        w = cdim[1]-x*2
+        crop = Cards._calculate_translation_matrix(-x, -y)
+
+        # resize 1.2x, cv2.resize maps pixel centers, not pixel corners
+        width = int(w * 1.2)
+        height = int(h * 1.2)
+        (sx, sy) = (width/w, height/h)
+        resize = np.array([[sx, 0, 0.5*sx - 0.5], [0, sy, 0.5*sy - 0.5], [0, 0, 1]])
+
+        return (resize @ crop @ self.warp_matrix @ crop_top @ rotate @ place, (width, height))
+
+    def _raster_rotated_multipass(self, im : np.ndarray, rotation : int) -> np.ndarray:
+        """
+        Original rasterization in separate steps, kept as reference for the homography engine
+        """
+        import cv2
         # resize image (TODO: fix this)
         #im = cv2.resize(im, (int(im.shape[1] * 1.3), int(im.shape[0] * 1.3)), interpolation = cv2.INTER_AREA)
 #
@@ -132,13 +255,24 @@ class Cards:
         height = int(c2dim[0] * 1.2)
         finalimg = cv2.resize(cropped2, (width, height), interpolation = cv2.INTER_AREA)
         #finalimg = cropped2
-
-        if self.opencv_mode:
-            return finalimg
-        return Cards._to_pygame_surface(finalimg)
+        return finalimg
 
     @staticmethod
     def _to_pygame_surface(opencv_image : np.ndarray) -> Surface:
+        """
+        Convert OpenCV images for Pygame.
+        The surface is created directly on the BGRA buffer of the image without copying it,
+        so the image must not be modified afterwards. Grayscale and BGR images are converted to BGRA first.
+        Benchmarked against the other converters in uno/bench.py
+        """
+        if opencv_image.ndim == 2 or opencv_image.shape[2] == 3:
+            import cv2
+            opencv_image = cv2.cvtColor(opencv_image, cv2.COLOR_GRAY2BGRA if opencv_image.ndim == 2 else cv2.COLOR_BGR2BGRA)
+        opencv_image = np.ascontiguousarray(opencv_image) # crops are strided views
+        return frombuffer(opencv_image, opencv_image.shape[1::-1], 'BGRA') # the surface keeps a reference to the buffer
+
+    @staticmethod
+    def convert_opencv_img_to_pygame_v1(opencv_image : np.ndarray) -> Surface:
         # from: https://linuxtut.com/en/f26e2756da774c164a47/
         """
         Convert OpenCV images for Pygame.
@@ -147,18 +281,19 @@ class Cards:
         """
         opencv_image = opencv_image[:,:,::-1]  # Since OpenCV is BGR and pygame is RGB, it is necessary to convert it.
         shape = opencv_image.shape[1::-1]  # OpenCV(height,width,Number of colors), Pygame(width, height)So this is also converted.
-        pygame_image = frombuffer(opencv_image.tostring(), shape, 'ARGB')
+        pygame_image = frombuffer(opencv_image.tobytes(), shape, 'ARGB')
 
         return pygame_image
     
     @staticmethod
-    def convert_opencv_img_to_pygame_v2(opencv_image): # TODO: test, might be a bit faster
+    def convert_opencv_img_to_pygame_v2(opencv_image): # drops the alpha channel
         """
         Convert OpenCV images for Pygame.
 
         see https://gist.github.com/radames/1e7c794842755683162b
         see https://github.com/atinfinity/lab/wiki/%5BOpenCV-Python%5D%E7%94%BB%E5%83%8F%E3%81%AE%E5%B9%85%E3%80%81%E9%AB%98%E3%81%95%E3%80%81%E3%83%81%E3%83%A3%E3%83%B3%E3%83%8D%E3%83%AB%E6%95%B0%E3%80%81depth%E5%8F%96%E5%BE%97
         """
+        import cv2
         if len(opencv_image.shape) == 2:
             #For grayscale images
             cvt_code = cv2.COLOR_GRAY2RGB
@@ -172,7 +307,7 @@ class Cards:
         return pygame_image
     
     @staticmethod
-    def convert_opencv_img_to_pygame_v3(opencv_image): # TODO: test, might be even more faster
+    def convert_opencv_img_to_pygame_v3(opencv_image): # drops the alpha channel, reuses surfaces of the same size
         """
         Convert OpenCV images for Pygame.
 
@@ -180,6 +315,7 @@ class Cards:
         see https://github.com/atinfinity/lab/wiki/%5BOpenCV-Python%5D%E7%94%BB%E5%83%8F%E3%81%AE%E5%B9%85%E3%80%81%E9%AB%98%E3%81%95%E3%80%81%E3%83%81%E3%83%A3%E3%83%B3%E3%83%8D%E3%83%AB%E6%95%B0%E3%80%81depth%E5%8F%96%E5%BE%97
         see https://stackoverflow.com/a/42589544/4907315
         """
+        import cv2
         if len(opencv_image.shape) == 2:
             #For grayscale images
             cvt_code = cv2.COLOR_GRAY2RGB
@@ -204,7 +340,8 @@ class Cards:
         return cached_surface
     
     @staticmethod
-    def _rotate_image2d(image : Mat, angle : int):
+    def _rotate_image2d(image : np.ndarray, angle : int):
+        import cv2
         image_center = tuple(np.array(image.shape[1::-1]) / 2)
         rot_mat = cv2.getRotationMatrix2D(image_center, angle, 1.0)
         result = cv2.warpAffine(image, rot_mat, image.shape[1::-1], flags=cv2.INTER_LINEAR)
@@ -244,6 +381,7 @@ class Cards:
         return R
 
 if __name__ == "__main__":
+    import cv2
     cards = Cards()
     cards.opencv_mode = True
     for i, c in enumerate(cards.get_random_cards(3)):
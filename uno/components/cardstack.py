@@ -1,6 +1,6 @@
 from __future__ import annotations
 from pygame.event import Event
-from pygame import Surface, SRCALPHA
+from pygame import Surface, Rect, SRCALPHA
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -28,6 +28,23 @@ class CardStack:
         image = image.convert_alpha()
         self.stack_img = image
         self.stack_size = 0
+        self.g.invalidate(self.get_rect())
+    
+    def resize(self, pos : tuple[int], size : tuple[int]) -> None:
+        """
+        Move the card stack and draw its cards again for the new size
+        """
+        if pos == self.pos and size == self.size:
+            return
+        stack_size = self.stack_size
+        self.g.invalidate(self.get_rect())
+        self.pos = pos
+        self.size = size
+        self.reset()
+        self.add_cards(stack_size)
+    
+    def get_rect(self) -> Rect:
+        return Rect(self.pos[0] - self.size[0]//2, self.pos[1] - self.size[1]//2, self.size[0], self.size[1])
     
     def setup(self) -> None:
         pass
@@ -55,7 +72,8 @@ class CardStack:
             elif self.stack_size < self.stack_height[5]:
                 pos = (self.size[0]//2 + 80, self.size[1] - 35 - (self.stack_size-self.stack_height[4])*self.v_dist)
             else:
-                return
+                break
             self.g.blit_aligned(self.card_back_img, pos, self.stack_img)
             self.stack_size += 1
+        self.g.invalidate(self.get_rect())
         
\ No newline at end of file
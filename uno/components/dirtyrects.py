@@ -0,0 +1,72 @@
+from __future__ import annotations
+from pygame import Rect
+
+
+class DirtyRects:
+    """
+    Collects the screen regions that changed since the last frame
+    A full redraw is requested by invalidating without a rect, e.g. on resize or screen change.
+    """
+    def __init__(self, screen_size : tuple) -> None:
+        self.screen_rect = Rect((0, 0), screen_size)
+        self.rects : list[Rect] = None # None means full redraw
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def resize(self, screen_size : tuple) -> None:
+        self.screen_rect = Rect((0, 0), screen_size)
+        self.invalidate()
+
+    def invalidate(self, rect : Rect = None) -> None:
+        """
+        Mark a region as changed
+        :param rect: changed region, None to redraw the whole screen
+        """
+        if rect is None:
+            self.rects = None
+            return
+        if self.rects is None:
+            return
+        rect = Rect(rect).clip(self.screen_rect)
+        if rect.width > 0 and rect.height > 0:
+            self.rects.append(rect)
+
+    def is_pending(self) -> bool:
+        """
+        Returns True if regions were invalidated that haven't been redrawn yet
+        """
+        return self.rects is None or len(self.rects) > 0
+
+    def begin_frame(self) -> list[Rect]:
+        """
+        Returns the regions to redraw in this frame, None for a full redraw
+        Regions invalidated from now on are redrawn in the next frame
+        """
+        rects = self.rects
+        self.rects = []
+        if rects is None:
+            self.full_frames += 1
+            return None
+        self.partial_frames += 1
+        return DirtyRects.merge(rects)
+
+    def get_counters(self) -> dict:
+        return {"full": self.full_frames, "partial": self.partial_frames}
+
+    @staticmethod
+    def merge(rects : list[Rect]) -> list[Rect]:
+        """
+        Merge overlapping rects, so no region is drawn twice
+        """
+        merged = []
+        for r in rects:
+            r = Rect(r)
+            i = 0
+            while i < len(merged):
+                if merged[i].colliderect(r):
+                    r.union_ip(merged.pop(i))
+                    i = 0
+                    continue
+                i += 1
+            merged.append(r)
+        return merged
@@ -0,0 +1,55 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from pygame import Surface, Rect
+from pygame.time import get_ticks
+from tabulate import tabulate
+
+from ..constants import *
+
+if TYPE_CHECKING:
+    from ..uno import Uno
+
+class FrameOverlay:
+    """
+    Shows the p50/p95/p99 frame times of the frame timer in the top right corner
+    The table is rendered again every refresh_interval ms, so drawing it barely shows up in the timings.
+    """
+    def __init__(self, g : Uno, refresh_interval : int = 500) -> None:
+        self.g = g
+        self.window = g.window
+        self.refresh_interval = refresh_interval
+        self.last_refresh = -refresh_interval
+        self.img : Surface = None
+        self.rect = Rect(0, 0, 0, 0)
+
+    def get_rect(self) -> Rect:
+        return self.rect
+
+    def draw(self) -> None:
+        if get_ticks() - self.last_refresh >= self.refresh_interval:
+            self.last_refresh = get_ticks()
+            self._render()
+        self.window.blit(self.img, self.rect)
+
+    def _render(self) -> None:
+        timer = self.g.frame_timer
+        lines = [["ms", "p50", "p95", "p99"]]
+        for name, values in timer.get_percentiles().items():
+            lines.append([name] + [f"{v:.2f}" for v in values])
+        lines.append([f"{len(timer.frames)} frames", "", "", ""])
+
+        # numbers change every time, so they don't go through the text cache
+        surfaces = [get_font(FONT_MONOSP_SM).render(l, True, WHITE) for l in tabulate(lines, headers="firstrow").splitlines()]
+        lineheight = get_font(FONT_MONOSP_SM).get_linesize()
+        padding = 10
+        w = max(s.get_width() for s in surfaces) + padding*2
+        h = lineheight*len(surfaces) + padding*2
+        self.img = Surface((w, h))
+        self.img.fill(BLACK)
+        self.img.set_alpha(200)
+        for i, s in enumerate(surfaces):
+            self.img.blit(s, (padding, padding + i*lineheight))
+
+        self.g.invalidate(self.rect) # clear the old table if it got smaller
+        self.rect = Rect(self.g.w - w - padding, 150, w, h)
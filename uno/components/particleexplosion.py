@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from pygame import Surface
+from pygame import Surface, Rect
 from pygame.event import Event
 from pygame.draw import rect
 from random import randint
@@ -24,6 +24,7 @@ class ParticleExplosion:
         for i in range(0, particles):
             vel = (randint(-10, 10), randint(-10, 10))
             self.particles.append({"pos": self.pos, "vel": vel, "life": duration})
+        self.g.invalidate(self.get_rect())
 
     def loop(self, window : Surface = None) -> None:
         if not self.finished:
@@ -31,6 +32,7 @@ class ParticleExplosion:
                 window = self.window
 
             particles_left = False
+            drawn_rect = self.get_rect()
             for p in self.particles:
                 self.g.blit_aligned(self.img, p["pos"], window)
                 p["pos"] = (p["pos"][0] + p["vel"][0], p["pos"][1] + p["vel"][1])
@@ -40,5 +42,18 @@ class ParticleExplosion:
                     continue
                 particles_left = True
         
+            # clear the drawn particles and draw the moved ones in the next frame
+            self.g.invalidate(drawn_rect.union(self.get_rect()) if particles_left else drawn_rect)
             if not particles_left:
-                self.finished = True
\ No newline at end of file
+                self.finished = True
+    
+    def get_rect(self) -> Rect:
+        """
+        Returns the bounding box of all particles
+        """
+        (w, h) = self.img.get_size()
+        if len(self.particles) == 0:
+            return Rect(self.pos[0] - w//2, self.pos[1] - h//2, w, h)
+        xs = [p["pos"][0] for p in self.particles]
+        ys = [p["pos"][1] for p in self.particles]
+        return Rect(min(xs) - w//2, min(ys) - h//2, max(xs) - min(xs) + w, max(ys) - min(ys) + h)
\ No newline at end of file
@@ -25,9 +25,9 @@ class Popup:
         self.rect_dims = (self.g.w//2 - self.g.w//4, self.g.h//2 - self.g.h//4, self.g.w//2, self.g.h//2)
         self.is_multiline = is_multiline
         if is_multiline:
-            self.font = FONT_MD
+            self.font = get_font(FONT_MD)
         else:
-            self.font = FONT_L
+            self.font = get_font(FONT_L)
         
         bsize = (150, 50)
         for i,b in enumerate(buttons):
@@ -36,7 +36,7 @@ class Popup:
                 int(self.rect_dims[3] - self.rect_dims[3]//2 + (self.rect_dims[3]//4)*3.5)
             )
             #bpos = (self.rect_dims[2], self.rect_dims[3] - self.rect_dims[3]//2 + (self.rect_dims[3]//4)*2)
-            self.buttons.append(Button(self.g, b, bpos, bsize, button_handler, FONT_MD, border_size=2))
+            self.buttons.append(Button(self.g, b, bpos, bsize, button_handler, get_font(FONT_MD), border_size=2))
 
     def draw(self, window : Surface = None) -> None:
         if window is None:
@@ -47,10 +47,10 @@ class Popup:
         rect(window, WHITE, self.rect_dims, 8)
 
         if self.heading is not None:
-            self.g.blit_aligned(FONT_XL.render(self.heading, True, WHITE), (self.rect_dims[2], self.rect_dims[3] - self.rect_dims[3]//2 + self.rect_dims[3]//4), window)
+            self.g.blit_aligned(self.g.render_text(get_font(FONT_XL), self.heading, WHITE), (self.rect_dims[2], self.rect_dims[3] - self.rect_dims[3]//2 + self.rect_dims[3]//4), window)
         if self.text is not None:
             if not self.is_multiline:
-                self.g.blit_aligned(self.font.render(self.text, True, WHITE), (self.rect_dims[2], self.rect_dims[3] - self.rect_dims[3]//2 + (self.rect_dims[3]//4)*2), window)
+                self.g.blit_aligned(self.g.render_text(self.font, self.text, WHITE), (self.rect_dims[2], self.rect_dims[3] - self.rect_dims[3]//2 + (self.rect_dims[3]//4)*2), window)
             else:
                 self.render_multi_line(self.text, self.g.w//2 - self.rect_dims[0]//2, self.g.h//2 - self.rect_dims[1]//2 + 50)
         
@@ -71,4 +71,4 @@ class Popup:
         lines = text.splitlines()
         fheight = self.font.get_height()
         for i, l in enumerate(lines):
-            self.window.blit(self.font.render(l, True, WHITE), (x, y + (fheight+6)*i))
\ No newline at end of file
+            self.window.blit(self.g.render_text(self.font, l, WHITE), (x, y + (fheight+6)*i))
\ No newline at end of file
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from pygame import Surface
+from pygame import Surface, Rect
 from pygame.event import Event
 from pygame.time import Clock, get_ticks
 from pygame.locals import *
@@ -15,7 +15,7 @@ if TYPE_CHECKING:
     from ..uno import Uno
 
 class ScrollableList:
-    def __init__(self, g : Uno, pos : tuple, size : tuple = (300, 300), font : Font = FONT_MD, direction : str = "toplast", yspacing : int = None) -> None:
+    def __init__(self, g : Uno, pos : tuple, size : tuple = (300, 300), font : Font = None, direction : str = "toplast", yspacing : int = None) -> None:
         self.g = g
         self.window = g.window
         self.pos = pos
@@ -23,7 +23,7 @@ class ScrollableList:
         self.direction = -1 if direction == "toplast" else 1
         self.lines = []
         self.maxlen = 200
-        self.font = font
+        self.font = get_font(FONT_MD) if font is None else font
         self.fontheight = self.font.get_height()
         self.is_moving = False
         self.yspacing = self.fontheight//6 if yspacing is None else yspacing
@@ -41,17 +41,30 @@ class ScrollableList:
                 self.last_vel = 0
             if self.yoffset > 0:
                 self.yoffset = 0
+            self.g.invalidate(self.get_rect())
             
         
         # draw history console in the bottom right corner
         for i,msg in enumerate(self.lines[::self.direction]):
-            txt = self.font.render(msg, True, WHITE)
+            txt = self.g.render_text(self.font, msg, WHITE)
             dim = txt.get_size()
             
             pos = (self.pos[0], self.pos[1] + (i+1)*(self.fontheight + self.yspacing) + self.yoffset)
             if pos[1] > self.pos[1]: # dont render the ones outside the top of their box
                 self.window.blit(txt, pos)
 
+    def is_animating(self) -> bool:
+        """
+        Returns True while the list keeps scrolling after being released
+        """
+        return self.last_vel != 0 and not self.is_moving
+
+    def get_rect(self) -> Rect:
+        """
+        Returns the region the list draws to, from its position to the bottom right of the window
+        """
+        return Rect(self.pos[0], self.pos[1], self.g.w - self.pos[0], self.g.h - self.pos[1])
+
     def mouse_event(self, event : Event) -> bool:
         t = event.type
         p = event.pos
@@ -61,9 +74,11 @@ class ScrollableList:
             btn = event.button
             if btn == BUTTON_WHEELDOWN:
                 self.yoffset = self.yoffset + 10
+                self.g.invalidate(self.get_rect())
                 return True
             if btn == BUTTON_WHEELUP:
                 self.yoffset = self.yoffset - 10
+                self.g.invalidate(self.get_rect())
                 return True
             if self.is_moving:
                 self.is_moving = False
@@ -77,6 +92,7 @@ class ScrollableList:
                 #self.pos += event.delta
                 self.yoffset = self.yoffset + event.rel[1]
                 self.last_vel = event.rel[1]
+                self.g.invalidate(self.get_rect())
                 return True
         
         return False
@@ -86,8 +102,10 @@ class ScrollableList:
         self.lines.append(msg)
         if len(self.lines) > self.maxlen:
             self.lines.pop(0)
+        self.g.invalidate(self.get_rect())
     
     def pop(self) -> None:
         self.yoffset = 0
         if len(self.lines) > 0:
-            self.lines.pop()
\ No newline at end of file
+            self.lines.pop()
+        self.g.invalidate(self.get_rect())
\ No newline at end of file
@@ -1,8 +1,30 @@
 from pygame import USEREVENT, Surface
-from pygame.font import SysFont
 from pygame.transform import scale
+from pygame.font import Font
+
+from .fontregistry import FontRegistry
 
 DEBUG = False
+DIRTY_RECT_RENDERING = True # only redraw the changed regions of the game screen
+IDLE_FRAME_SCHEDULER = True # sleep until the next event while the screen is not animating
+RETAIN_SCREEN_STATE = True # keep the game screen when switching to an other screen and back
+
+# savegames
+SAVE_MODE = "journal" # "journal" appends every action to saves/<name>.journal, "full" rewrites the savegame each time
+JOURNAL_SNAPSHOT_INTERVAL = 500 # rewrite the savegame after this many journal records
+SAVE_WRITER_THREAD = True # write savegames on a background thread
+SAVE_CACHE_MAX_BYTES = 64*1024*1024 # on-disk size of parsed savegames kept in memory by the load and stats screens
+
+# rendering
+TEXT_CACHE_MAX_ENTRIES = 512 # rendered text surfaces kept in memory
+ASSET_CACHE_MAX_ENTRIES = 64 # decoded and scaled images from the assets folder kept in memory
+ASSET_PRELOAD = [("star.png", 0.2), ("crown.png", 0.1), ("crown.png", 0.3)] # (name, rescale) loaded in the background while the menu is shown
+CARD_CACHE_DIR = "card_cache" # rasterized cards, relative to the app folder
+CARD_RASTER_ENGINE = "homography" # "homography" warps cards in one pass, "multipass" is the original pipeline
+CARD_RASTER_THREADS = 8 # thread pool size for rasterizing several cards at once, 1 disables the pool
+CARD_SCALE_FACTOR = 0.80 # size of the cards on the game screen
+CARD_BUNDLE_MAX_PLAYERS = 8 # cards/gen/bundle.py prebakes the card stacks of games with up to this many players
+FRAME_TIMER_MAX_FRAMES = 600 # frames kept by the frame timer, F3 shows their percentiles and F4 writes them to a csv file
 
 # colors
 WHITE = (255, 255, 255)
@@ -11,14 +33,22 @@ RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 YELLOW = (255, 255, 0)
 
-FONT_SM = SysFont('freesansbold', 1080//40)
-FONT_MD = SysFont('freesansbold', 1080//30)
-FONT_L = SysFont('freesansbold', 1080//25)
-FONT_LG = SysFont('freesansbold', 1080//20)
-FONT_XL = SysFont('freesansbold', 1080//10)
-FONT_MONOSP_SM = SysFont('courier', 1080//42)
-FONT_MONOSP = SysFont('courier', 1080//25)
-FONT_MONOSP_LARGE = SysFont('courier', 1080//18)
+# fonts as (name, divisor), the size is the smaller window dimension divided by the divisor
+FONTS = FontRegistry()
+FONT_SM = ('freesansbold', 40)
+FONT_MD = ('freesansbold', 30)
+FONT_L = ('freesansbold', 25)
+FONT_LG = ('freesansbold', 20)
+FONT_XL = ('freesansbold', 10)
+FONT_MONOSP_SM = ('courier', 42)
+FONT_MONOSP = ('courier', 25)
+FONT_MONOSP_LARGE = ('courier', 18)
+
+def get_font(font : tuple) -> Font:
+    """
+    Returns one of the FONT_* fonts in the size for the current window
+    """
+    return FONTS.get_scaled(*font)
 
 # custom events
 UPDATE_GAME_STATS = USEREVENT + 1
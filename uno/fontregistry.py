@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pygame.font import Font, match_font
+
+
+class FontRegistry:
+    """
+    Fonts shared by all screens
+    Font names are resolved to font files once, Font objects are cached by (name, size).
+    Names work like in SysFont, unknown fonts fall back to the pygame default font.
+    The returned fonts are shared, their style must not be changed.
+    """
+    def __init__(self, reference_size : int = 1080) -> None:
+        self.reference_size = reference_size # smaller window dimension that scaled sizes are relative to
+        self.files : dict[str, str] = {} # name -> font file, None for the default font
+        self.fonts : dict[tuple, Font] = {} # (name, size) -> font
+
+    def get(self, name : str, size : int) -> Font:
+        """
+        Returns a font, creating it only if it isn't cached
+        :param name: font name or comma separated list of names, e.g. "courier"
+        :param size: size in pixels
+        """
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is not None:
+            return font
+
+        font = Font(self.resolve(name), size)
+        self.fonts[key] = font
+        return font
+
+    def get_scaled(self, name : str, divisor : int) -> Font:
+        """
+        Returns a font sized relative to the window, e.g. divisor 40 is 27 pixels on a 1080p window
+        :param name: font name
+        :param divisor: the smaller window dimension is divided by this
+        """
+        return self.get(name, self.get_scaled_size(divisor))
+
+    def get_scaled_size(self, divisor : int) -> int:
+        return self.reference_size // divisor
+
+    def set_reference_size(self, reference_size : int) -> None:
+        """
+        Set the smaller window dimension for scaled sizes, fonts of other sizes stay cached
+        """
+        self.reference_size = reference_size
+
+    def resolve(self, name : str) -> str:
+        """
+        Returns the font file of a font name, None if it isn't installed
+        The system font list is only scanned on the first call.
+        """
+        if not name in self.files:
+            self.files[name] = match_font(name)
+        return self.files[name]
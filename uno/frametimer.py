@@ -0,0 +1,94 @@
+from __future__ import annotations
+import csv
+from collections import deque
+from contextlib import nullcontext
+from time import perf_counter
+
+
+class FrameTimer:
+    """
+    Times the sections of the last frames, e.g. event dispatch, drawing of components and the display update
+    A frame is a dictionary of section name -> milliseconds, sections that run several times per frame
+    (e.g. once per dirty rect) are summed up. Only the last max_frames frames are kept.
+    Nothing is timed while the timer is disabled.
+    """
+    def __init__(self, max_frames : int = 600) -> None:
+        self.enabled = False
+        self.frames : deque[dict] = deque(maxlen=max_frames)
+        self.current : dict = None
+        self.frame_start = 0
+        self.frame_count = 0 # number of the next frame, including the ones dropped from the buffer
+
+    def begin_frame(self) -> None:
+        if not self.enabled:
+            self.current = None
+            return
+        self.current = {}
+        self.frame_start = perf_counter()
+
+    def end_frame(self) -> None:
+        if self.current is None:
+            return
+        self.current["frame"] = (perf_counter() - self.frame_start) * 1000
+        self.current["num"] = self.frame_count
+        self.frame_count += 1
+        self.frames.append(self.current)
+        self.current = None
+
+    def measure(self, name : str) -> object:
+        """
+        Returns a context manager that adds the time spent in it to a section of the current frame
+        :param name: section name
+        """
+        if self.current is None:
+            return nullcontext()
+        return FrameSection(self.current, name)
+
+    def get_sections(self) -> list[str]:
+        """
+        Returns the names of all sections in the buffer, in the order they were first timed
+        """
+        sections = {}
+        for f in self.frames:
+            for k in f:
+                if k != "num":
+                    sections[k] = None
+        return list(sections.keys())
+
+    def get_percentiles(self, percentiles : list[int] = [50, 95, 99]) -> dict[str, list[float]]:
+        """
+        Returns the percentiles of every section in milliseconds, frames without a section count as 0 ms
+        """
+        result = {}
+        for name in self.get_sections():
+            times = sorted(f.get(name, 0) for f in self.frames)
+            result[name] = [times[max(0, -(-len(times)*p//100) - 1)] for p in percentiles] # nearest rank
+        return result
+
+    def write_csv(self, path : str) -> None:
+        """
+        Write the buffered frames to a csv file, one row per frame and one column per section in ms
+        """
+        sections = self.get_sections()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["num"] + sections)
+            for frame in self.frames:
+                writer.writerow([frame["num"]] + [round(frame.get(s, 0), 4) for s in sections])
+
+    def clear(self) -> None:
+        self.frames.clear()
+
+
+class FrameSection:
+    __slots__ = ("frame", "name", "start")
+
+    def __init__(self, frame : dict, name : str) -> None:
+        self.frame = frame
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.frame[self.name] = self.frame.get(self.name, 0) + (perf_counter() - self.start) * 1000
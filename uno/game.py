@@ -19,9 +19,10 @@ from .components.particleexplosion import ParticleExplosion
 from .components.popup import Popup
 from .components.scrollablelist import ScrollableList
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 if TYPE_CHECKING:
     from .uno import Uno
+    from .player import Player
 
 class Game:
     """
@@ -30,9 +31,43 @@ class Game:
     def __init__(self, game : Uno) -> None:
         self.g = game
         self.window = self.g.window
+        self.cards_gen = None
+        self.state_key = None # game and window size the screen was set up for
 
     #########################################################################################
 
+    def enter(self) -> None:
+        """
+        Called when the screen is shown
+        The screen is only set up again if an other game was started or loaded, otherwise cards, card stacks
+        and session stats are kept. If the window size changed meanwhile, only the layout is updated.
+        """
+        if not RETAIN_SCREEN_STATE or self.state_key is None or self.state_key[0] != self.g.game_id:
+            self.setup()
+            return
+        if self.state_key != self._get_state_key():
+            self.resize()
+        
+        self.dragging_card = {}
+        self.g.invalidate()
+        self._update_last_action_time()
+        set_timer(UPDATE_GAME_STATS, 1000)
+    
+    def exit(self) -> None:
+        """
+        Called when an other screen is shown
+        """
+        set_timer(UPDATE_GAME_STATS, 0)
+        self.dragging_card = {}
+    
+    def resize(self) -> None:
+        """
+        Called when the window size changed, places everything for the new size and keeps the game state
+        """
+        self._layout()
+        self.g.invalidate()
+        self.state_key = self._get_state_key()
+    
     def setup(self) -> None:
         if self.g.pcount == 0:
             self.g.setstate(0)
@@ -44,67 +79,103 @@ class Game:
         self.card_padding = 30
         self.aa = True
         self.dragging_card = {}
-        self.cards_gen = Cards(scale_factor=0.80)
+        self._load_resources()
         self.cards = []
         self.card_stacks : list[CardStack]= []
         self.card_pos = (0, 0)
         self.popup = None
+        self.popup_shown = False
+        self.label_keys = {} # player num -> values shown in the players label, to find changed labels
+        self.dirty_rendering = True
         self.particleexplosions = []
-        self.star_image = self.g.load_asset_image("star.png", 0.2)
-        self.mini_card_back_img = rescale(self.cards_gen.raster_playing_card("back"), 0.12)
-        # mini_initial_card_back_image_size = mini_initial_card_back_image.get_size()
-        # mini_card_back_img_scale = 0.12
-        # self.mini_card_back_img = scale(mini_initial_card_back_image, size=(int(mini_initial_card_back_image_size[0]*mini_card_back_img_scale), int(mini_initial_card_back_image_size[1]*mini_card_back_img_scale)))
-        self.crown_img = self.g.load_asset_image("crown.png", 0.1)
-        self.table_img = self.g.load_asset_image("table.png", 0.5)
+
+        # the rotated card backs of the players are rendered in parallel
+        stack_imgs = self.cards_gen.raster_playing_cards([("back", Cards.get_stack_rotation(p.num, self.g.pcount)) for p in self.g.players])
+
         self.last_action_time = None
         self.popup_delay = 300_000 # 5 min
         
         #self.history_console_length = 16
 
+        self.session_stats = {}
+        self.current_game_stats = {}
+        self.session_actions = [] # actions of this session, used to revert the session stats on undo
+        for i,p in enumerate(self.g.players):
+            # add cardstacks for each player, they are placed by _layout
+            self.card_stacks.append(CardStack(g = self.g, img = stack_imgs[i], pos = (0, 0), size = (0, 0)))
+
+            # add session stats
+            self.session_stats[p.name] = {"wins": 0, "cards": 0}
+            self.current_game_stats[p.name] = {"wins": 0, "cards": 0}
+        
+        # Instanciate the history console 
+        self.history_console = ScrollableList(self.g, (0, 0))
+        self._layout()
+
+        self._update_last_action_time()
+
+        set_timer(UPDATE_GAME_STATS, 1000)
+        self.state_key = self._get_state_key()
+    
+    def _layout(self) -> None:
+        """
+        Place buttons, drawing cards, card stacks and the history console for the current window size
+        """
         self.segwidth = self.g.w / self.g.pcount
         self.buttons = [
-            Button(self.g, "Back", (100, 50), (200, 100), self.button_handler, FONT_LG),
-            Button(self.g, "Undo", (300, 50), (200, 100), self.button_handler, FONT_LG),
-            Button(self.g, "Stats", (500, 50), (200, 100), self.button_handler, FONT_LG),
-            Button(self.g, "Pause", (700, 50), (200, 100), self.button_handler, FONT_LG),
-            Button(self.g, "Help", (900, 50), (200, 100), self.button_handler, FONT_LG),
+            Button(self.g, "Back", (100, 50), (200, 100), self.button_handler, get_font(FONT_LG)),
+            Button(self.g, "Undo", (300, 50), (200, 100), self.button_handler, get_font(FONT_LG)),
+            Button(self.g, "Redo", (500, 50), (200, 100), self.button_handler, get_font(FONT_LG)),
+            Button(self.g, "Stats", (700, 50), (200, 100), self.button_handler, get_font(FONT_LG)),
+            Button(self.g, "Pause", (900, 50), (200, 100), self.button_handler, get_font(FONT_LG)),
+            Button(self.g, "Help", (1100, 50), (200, 100), self.button_handler, get_font(FONT_LG)),
         ]
 
         self.card_sec_height = self.cards_gen.h + self.card_padding*2
         
         card_y = self.g.h - self.card_sec_height/2
+        self.cards = []
         for i,card in enumerate(self.cards_gen.drawing_cards):
             card_x = self.cards_gen.w//2 + self.cards_gen.w*i + self.card_padding*(i+1)
-            self.cards.append({"card": card, "img": self.cards_gen.raster_playing_card(card), "pos": (card_x, card_y), "value": int(card[-1:])})
+            self.cards.append({"card": card, "img": self.drawing_card_imgs[i], "pos": (card_x, card_y), "value": int(card[-1:])})
 
         player_sec_height = self.g.h - self.card_sec_height - 155
-        self.session_stats = {}
-        self.current_game_stats = {}
-        for p in self.g.players:
-            # add cardstacks for each player
-            cstack = CardStack(
-                g = self.g, 
-                img = self.cards_gen.raster_playing_card("back", 30 - (60/(self.g.pcount - 1)*(p["num"]-1))), 
-                pos = (self._get_player_position(p["num"]), self.g.h - self.card_sec_height - player_sec_height//1.4), 
+        for i,p in enumerate(self.g.players):
+            #cstack.add_cards(p.cards) # reset the card stack each time, because the current way keeps making sense when thousands of cards have been drawn
+            self.card_stacks[i].resize(
+                pos = (self._get_player_position(p.num), self.g.h - self.card_sec_height - player_sec_height//1.4), 
                 size = (self.segwidth, player_sec_height)
             )
-            #cstack.add_cards(p["cards"]) # reset the card stack each time, because the current way keeps making sense when thousands of cards have been drawn
-            self.card_stacks.append(cstack)
 
             # regarding win-buttons
-            self.buttons.append(Button(self.g, f"f::crown.png::0.30::win::{p['num']}", self._get_win_button_pos(p["num"]), None, self.button_handler, FONT_LG, border_size=-1))
-
-            # add session stats
-            self.session_stats[p["name"]] = {"wins": 0, "cards": 0}
-            self.current_game_stats[p["name"]] = {"wins": 0, "cards": 0}
+            self.buttons.append(Button(self.g, f"f::crown.png::0.30::win::{p.num}", self._get_win_button_pos(p.num), None, self.button_handler, get_font(FONT_LG), border_size=-1))
         
-        # Instanciate the history console 
-        self.history_console = ScrollableList(self.g, (self.g.w - 300, self.g.h - self.card_sec_height + 5))
-
-        self._update_last_action_time()
+        self.history_console.pos = (self.g.w - 300, self.g.h - self.card_sec_height + 5)
+    
+    def _load_resources(self) -> None:
+        """
+        Load the images that don't depend on the players, only once per screen
+        """
+        if self.cards_gen is not None:
+            return
+        self.cards_gen = Cards(scale_factor=CARD_SCALE_FACTOR, cache=self.g.card_cache)
+        self.star_image = self.g.load_asset_image("star.png", 0.2)
 
-        set_timer(UPDATE_GAME_STATS, 1000)
+        card_imgs = self.cards_gen.raster_playing_cards([("back", None)] + [(card, None) for card in self.cards_gen.drawing_cards])
+        self.mini_card_back_img = rescale(card_imgs[0], 0.12)
+        # mini_initial_card_back_image_size = mini_initial_card_back_image.get_size()
+        # mini_card_back_img_scale = 0.12
+        # self.mini_card_back_img = scale(mini_initial_card_back_image, size=(int(mini_initial_card_back_image_size[0]*mini_card_back_img_scale), int(mini_initial_card_back_image_size[1]*mini_card_back_img_scale)))
+        self.drawing_card_imgs = card_imgs[1:]
+        self.crown_img = self.g.load_asset_image("crown.png", 0.1)
+        self.table_img = None # only drawn in debug mode and not shipped with the assets
+        try:
+            self.table_img = self.g.load_asset_image("table.png", 0.5)
+        except FileNotFoundError as e:
+            print(f"Error loading table image: {e}")
+    
+    def _get_state_key(self) -> tuple:
+        return (self.g.game_id, self.g.w, self.g.h)
     
     def button_handler(self, name : str) -> None:
         if name == "Back":
@@ -116,27 +187,25 @@ class Game:
             return
 
         elif name == "Undo":
-            name, action, value = self.g.undo()
-            if name: 
-                # if undo was successfull, update history console, session_stats and current_game_stats
-                self.history_console.pop()
-                
-                if action == "draw":
-                    key = "cards"
-                    num = value
-                elif action == "win":
-                    key = "wins"
-                    num = 1
-                else:
-                    return
-                
-                self.current_game_stats[name][key] -= num
-                if self.current_game_stats[name][key] < 0:
-                    self.current_game_stats[name][key] = 0
-                
-                self.session_stats[name][key] -= num
-                if self.session_stats[name][key] < 0:
-                    self.session_stats[name][key] = 0
+            if self.g.undo() is None:
+                return
+            # if undo was successfull, update history console, session_stats and current_game_stats
+            self.history_console.pop()
+            if len(self.session_actions) > 0:
+                a = self.session_actions.pop()
+                self.session_stats[a["name"]][a["key"]] -= a["value"]
+                self.current_game_stats = a["current_game_stats"]
+                self.game_start_time = a["game_start_time"]
+            self._update_last_action_time()
+            return
+        
+        elif name == "Redo":
+            result = self.g.redo()
+            if result is None:
+                return
+            p, action, value, action_time = result
+            self._session_action(p, action, value)
+            self._update_last_action_time()
             return
 
         elif name == "Pause":
@@ -151,24 +220,26 @@ class Game:
             parts = name.split("::")
             if parts[-2] == "win":
                 for p in self.g.players:
-                    if int(parts[-1]) == p['num']:
+                    if int(parts[-1]) == p.num:
                         self._player_action(p, "win")
-                        self.particleexplosions.append(ParticleExplosion(self.g, self.star_image, self._get_win_button_pos(p["num"]), 240))
+                        self.particleexplosions.append(ParticleExplosion(self.g, self.star_image, self._get_win_button_pos(p.num), 240))
             return
         print(f"Unknown button: {name}")
     
     def refresh_stats_surfaces(self) -> None:
+        if hasattr(self, "stats_surfaces"):
+            self.g.invalidate(self._get_stats_rect())
         game_time_str = timedelta(seconds=self.g.get_game_time()//1000)
-        game_wins_str = sum([p["wins"] for p in self.g.players])
-        game_cards_str = sum([p["cards"] for p in self.g.players])
+        game_wins_str = sum([p.wins for p in self.g.players])
+        game_cards_str = sum([p.cards for p in self.g.players])
 
         session_time_str = timedelta(seconds=(get_ticks()-self.session_start_time)//1000)
-        session_wins_str = sum([self.session_stats[p["name"]]["wins"] for p in self.g.players])
-        session_cards_str = sum([self.session_stats[p["name"]]["cards"] for p in self.g.players])
+        session_wins_str = sum([self.session_stats[p.name]["wins"] for p in self.g.players])
+        session_cards_str = sum([self.session_stats[p.name]["cards"] for p in self.g.players])
 
         this_game_time_str = timedelta(seconds=(get_ticks()-self.game_start_time)//1000)
-        #current_game_wins_str = sum([self.current_game_stats[p["name"]]["wins"] for p in self.g.players])
-        current_game_cards_str = sum([self.current_game_stats[p["name"]]["cards"] for p in self.g.players])
+        #current_game_wins_str = sum([self.current_game_stats[p.name]["wins"] for p in self.g.players])
+        current_game_cards_str = sum([self.current_game_stats[p.name]["cards"] for p in self.g.players])
         lines = [
             ["", "Time", "Wins", "Cards"],
             [f"Game stats", f"{game_time_str}", f"{game_wins_str}", f"{game_cards_str}"],
@@ -177,79 +248,145 @@ class Game:
         ]
         if self.g.debug:
             lines.append(["FPS", int(self.g.clock.get_fps()*10)/10, "", ""])
+            saves = self.g.save_writer.get_counters()
+            lines.append(["Saves", f"{saves['queued']} queued", f"{saves['coalesced']} coal.", f"{saves['written']} written"])
+            texts = self.g.text_cache.get_counters()
+            lines.append(["Text cache", f"{texts['entries']} entries", f"{texts['hits']} hits", f"{texts['misses']} misses"])
+            assets = self.g.asset_cache.get_counters()
+            lines.append(["Asset cache", f"{assets['entries']} entries", f"{assets['hits']} hits", f"{assets['misses']} misses"])
+            frames = self.g.dirty.get_counters()
+            lines.append(["Dirty rects", f"{frames['full']} full", f"{frames['partial']} partial", ""])
         statslines = tabulate(lines).splitlines()
         self.stats_surfaces = []
         self.stats_surfaces_maxwidth = 0
         for ls in statslines[1:-1]:
-            lineimg = FONT_MONOSP_SM.render(ls, self.aa, WHITE)
+            lineimg = get_font(FONT_MONOSP_SM).render(ls, self.aa, WHITE)
             self.stats_surfaces_maxwidth = max(lineimg.get_width(), self.stats_surfaces_maxwidth)
             self.stats_surfaces.append(lineimg)
         self.stats_surfaces_fontheight = lineimg.get_size()[1] # they have the same height
+        self.g.invalidate(self._get_stats_rect())
         
     def loop(self, events : list[Event]) -> None:
         if UPDATE_GAME_STATS in [e.type for e in events]:
             self.refresh_stats_surfaces()
         
-        if self.g.debug:
-            self.window.blit(self.table_img, (0, self.g.h-self.card_sec_height - self.table_img.get_height()))
+        if not self.popup and self.last_action_time + self.popup_delay < get_ticks():
+            self._display_pause_popup() # this enables the popup
+        
+        # find changed regions
+        for p in self.g.players:
+            label_key = (p.cards, p.wins, self.session_stats[p.name]["cards"], self.session_stats[p.name]["wins"], self.current_game_stats[p.name]["cards"])
+            if self.label_keys.get(p.num) != label_key:
+                self.label_keys[p.num] = label_key
+                self.g.invalidate(self._get_player_label_rect(p.num))
+        if self.popup or self.popup_shown:
+            self.g.invalidate() # popups are drawn over everything, redraw the whole window while one is shown
+        self.popup_shown = self.popup is not None
+        
+        rects = self.g.begin_dirty_frame()
+        if rects is None:
+            self.window.blit(self.g.bg, (0, 0))
+            self._draw_scene()
+        else:
+            for r in rects:
+                self.window.set_clip(r)
+                self.window.blit(self.g.bg, r, r)
+                self._draw_scene(r)
+            self.window.set_clip(None)
+        
+        # particles are updated once per frame, they invalidate the regions they are drawn to
+        with self.g.frame_timer.measure("particles"):
+            for p in self.particleexplosions:
+                p.loop()
+                if p.finished:
+                    self.particleexplosions.remove(p)
+        
+        with self.g.frame_timer.measure("popup"):
+            if self.popup:
+                self.popup.draw()
+    
+    def get_idle_timeout(self) -> Optional[int]:
+        """
+        Returns the milliseconds until the screen has to be redrawn without input, 0 while animating, None to wait for input
+        """
+        if len(self.particleexplosions) > 0 or self.history_console.is_animating():
+            return 0
+        if self.popup:
+            return None # the popup stays until it is clicked, stats are updated by their timer event
+        return max(self.last_action_time + self.popup_delay - get_ticks() + 1, 1)
+    
+    def _draw_scene(self, clip : Rect = None) -> None:
+        """
+        Draws the game screen, parts outside of clip are skipped
+        :param clip: region to draw, None for the whole window
+        """
+        def visible(r : Rect) -> bool:
+            return clip is None or clip.colliderect(r)
+        timer = self.g.frame_timer
+        
+        if self.g.debug and self.table_img is not None:
+            table_pos = (0, self.g.h-self.card_sec_height - self.table_img.get_height())
+            if visible(Rect(table_pos, self.table_img.get_size())):
+                self.window.blit(self.table_img, table_pos)
 
-        for c in self.cards:
-            self.g.blit_aligned(c["img"], c["pos"])
+        with timer.measure("cards"):
+            for c in self.cards:
+                if visible(self._get_centered_rect(c["pos"], c["img"].get_size())):
+                    self.g.blit_aligned(c["img"], c["pos"])
         
-        for st in self.card_stacks:
-            st.draw()
+        with timer.measure("card stacks"):
+            for st in self.card_stacks:
+                if visible(st.get_rect()):
+                    st.draw()
         
-        for p in self.g.players:
-            lpos = self.g.w//self.g.pcount*p["num"]
+        with timer.measure("labels"):
+            for p in self.g.players:
+                lpos = self.g.w//self.g.pcount*p.num
+            
+                # vlines
+                if p.num < self.g.pcount and visible(Rect(lpos - 3, 0, 6, self.g.h - self.card_sec_height)):
+                    line(self.window, WHITE, (lpos, 0), (lpos, self.g.h - self.card_sec_height), 5)
             
-            # vlines
-            if p["num"] < self.g.pcount:
-                line(self.window, WHITE, (lpos, 0), (lpos, self.g.h - self.card_sec_height), 5)
+                if not visible(self._get_player_label_rect(p.num)):
+                    continue
             
-            # name
-            tpos = lpos - self.segwidth + 20
-            session_stats_xpos = lpos - self.segwidth//2
-            current_game_stats_xpos = session_stats_xpos + 40
-            align = (0, 2)
+                # name
+                tpos = lpos - self.segwidth + 20
+                session_stats_xpos = lpos - self.segwidth//2
+                current_game_stats_xpos = session_stats_xpos + 40
+                align = (0, 2)
             
-            self.g.blit_aligned(FONT_LG.render(f"{p['name']}", self.aa, self.g.player_colors[p["num"]]), (tpos, self.g.h-self.card_sec_height-120), align=align)
-            self.g.blit_aligned(self.mini_card_back_img, (tpos, self.g.h-self.card_sec_height-80), align=align)
-            self.g.blit_aligned(FONT_LG.render(f"     x {p['cards']} / {self.session_stats[p['name']]['cards']} / {self.current_game_stats[p['name']]['cards']}", self.aa, self.g.player_colors[p["num"]]), (tpos, self.g.h-self.card_sec_height-80), align=align)
+                self.g.blit_aligned(self.g.render_text(get_font(FONT_LG), f"{p.name}", self.g.player_colors[p.num], self.aa), (tpos, self.g.h-self.card_sec_height-120), align=align)
+                self.g.blit_aligned(self.mini_card_back_img, (tpos, self.g.h-self.card_sec_height-80), align=align)
+                self.g.blit_aligned(self.g.render_text(get_font(FONT_LG), f"     x {p.cards} / {self.session_stats[p.name]['cards']} / {self.current_game_stats[p.name]['cards']}", self.g.player_colors[p.num], self.aa), (tpos, self.g.h-self.card_sec_height-80), align=align)
             
-            self.g.blit_aligned(self.crown_img, (tpos+10, self.g.h-self.card_sec_height-40))
-            self.g.blit_aligned(FONT_LG.render(f"     x {p['wins']} / {self.session_stats[p['name']]['wins']}", self.aa, self.g.player_colors[p["num"]]), (tpos, self.g.h-self.card_sec_height-40), align=align)
+                self.g.blit_aligned(self.crown_img, (tpos+10, self.g.h-self.card_sec_height-40))
+                self.g.blit_aligned(self.g.render_text(get_font(FONT_LG), f"     x {p.wins} / {self.session_stats[p.name]['wins']}", self.g.player_colors[p.num], self.aa), (tpos, self.g.h-self.card_sec_height-40), align=align)
             
         # hlines
         line(self.window, WHITE, (0, self.g.h - self.card_sec_height), (self.g.w, self.g.h - self.card_sec_height), 5)
         line(self.window, WHITE, (0, self.g.h - self.card_sec_height - 155), (self.g.w, self.g.h - self.card_sec_height - 155), 5)
 
         # game stats in the top right corner
-        rect(self.window, BLACK, (self.g.w - self.stats_surfaces_maxwidth - 10, 5, self.g.w - 5, 5*(3+1) + 4*self.stats_surfaces_fontheight), border_radius=10)
-        for i, img in enumerate(self.stats_surfaces):
-            self.window.blit(img, (self.g.w - self.stats_surfaces_maxwidth - 5, 5*(i+1) + i*self.stats_surfaces_fontheight))
+        if visible(self._get_stats_rect()):
+            rect(self.window, BLACK, (self.g.w - self.stats_surfaces_maxwidth - 10, 5, self.g.w - 5, 5*(3+1) + 4*self.stats_surfaces_fontheight), border_radius=10)
+            for i, img in enumerate(self.stats_surfaces):
+                self.window.blit(img, (self.g.w - self.stats_surfaces_maxwidth - 5, 5*(i+1) + i*self.stats_surfaces_fontheight))
         
         # history console
-        self.history_console.draw()
+        with timer.measure("history console"):
+            if visible(self.history_console.get_rect()):
+                self.history_console.draw()
 
         # menu buttons
-        for b in self.buttons:
-            b.draw()
-        
-        for p in self.particleexplosions:
-            p.loop()
-            if p.finished:
-                self.particleexplosions.remove(p)
+        with timer.measure("buttons"):
+            for b in self.buttons:
+                if visible(b.get_rect()):
+                    b.draw()
 
         if self.dragging_card:
             self.g.blit_aligned(self.dragging_card["img"], self.card_pos)
         
-        if self.popup:
-            self.popup.draw()
-        
-        elif self.last_action_time + self.popup_delay < get_ticks():
-            self._display_pause_popup() # this enables the popup
-        
-    
     def keydown(self, k : int, kmods : int) -> bool:
         if k == K_q or k == K_ESCAPE:
             self.g.setstate(0)
@@ -293,6 +430,7 @@ class Game:
                 if self.g.check_collision_center(c["pos"], c["img"].get_size(), p):
                     self.dragging_card = c
                     self.card_pos = c["pos"]
+                    self._invalidate_dragging_card()
                     return True
         
         elif t == MOUSEBUTTONUP:
@@ -302,10 +440,11 @@ class Game:
             is_over_player = self._get_player_clicked(p)
 
             if self.dragging_card:
+                self._invalidate_dragging_card()
 
                 if not is_over_player is None:
                     value = self.dragging_card["value"]
-                    self.card_stacks[is_over_player["num"] - 1].add_cards(value)
+                    self.card_stacks[is_over_player.num - 1].add_cards(value)
                     self._player_action(is_over_player, "draw", value)
                     self.dragging_card = {}
                 else:
@@ -323,7 +462,9 @@ class Game:
             r = event.rel
             b = event.buttons
             if self.dragging_card:
+                self._invalidate_dragging_card()
                 self.card_pos = (self.card_pos[0]+r[0], self.card_pos[1]+r[1])
+                self._invalidate_dragging_card()
                 return True
         return False
 
@@ -339,15 +480,36 @@ class Game:
         self.last_action_time = get_ticks()
         self.refresh_stats_surfaces()
     
-    def _get_player_clicked(self, click_pos : tuple) -> dict:
+    def _get_player_clicked(self, click_pos : tuple) -> Player:
         if click_pos[1] > self.g.h-self.card_sec_height:
             return None
         for p in self.g.players:
-            lpos = self.g.w//self.g.pcount*p["num"]
+            lpos = self.g.w//self.g.pcount*p.num
             if click_pos[0] > lpos - self.segwidth and click_pos[0] < lpos:
                 return p
         return None
     
+    def _invalidate_dragging_card(self) -> None:
+        self.g.invalidate(self._get_centered_rect(self.card_pos, self.dragging_card["img"].get_size()))
+    
+    def _get_player_label_rect(self, pnum : int) -> Rect:
+        """
+        Returns the region of the players name, cards and wins
+        """
+        lpos = self.g.w//self.g.pcount*pnum
+        return Rect(lpos - self.segwidth, self.g.h - self.card_sec_height - 155, self.segwidth, 155)
+    
+    def _get_stats_rect(self) -> Rect:
+        """
+        Returns the region of the game stats in the top right corner
+        """
+        lines = max(len(self.stats_surfaces), 4)
+        return Rect(self.g.w - self.stats_surfaces_maxwidth - 10, 5, self.stats_surfaces_maxwidth + 10, 5*(lines+1) + lines*self.stats_surfaces_fontheight)
+    
+    @staticmethod
+    def _get_centered_rect(pos : tuple, size : tuple) -> Rect:
+        return Rect(pos[0] - size[0]//2, pos[1] - size[1]//2, size[0], size[1])
+    
     def _get_player_position(self, pnum : int) -> int:
         lpos = self.g.w//self.g.pcount*pnum
         return lpos - self.segwidth//2
@@ -357,31 +519,47 @@ class Game:
         winbtn_y = self.g.h - self.card_sec_height - 77
         return (winbtn_x, winbtn_y)
     
-    def _player_action(self, p : dict, action : str, value : int = 1) -> None:
+    def _player_action(self, p : Player, action : str, value : int = 1) -> None:
         if p is None:
             return
 
-        print(f"{p['name']} {action} {value}")
+        print(f"{p.name} {action} {value}")
         
         if action == "draw":
-            p["cards"] += value
-            self.history_console.add(f"{p['name']} draws {value} cards")
-            self.session_stats[p["name"]]["cards"] += value
-            self.current_game_stats[p["name"]]["cards"] += value
+            p.cards += value
+        elif action == "win":
+            p.wins += value
+        self._session_action(p, action, value)
+        
+        self.g.playerdata_changed(p, action)
+        self._update_last_action_time()
+    
+    def _session_action(self, p : Player, action : str, value : int) -> None:
+        """
+        Updates history console, session_stats and current_game_stats after a player action
+        """
+        self.session_actions.append({
+            "name": p.name, 
+            "key": "wins" if action == "win" else "cards", 
+            "value": value, 
+            "current_game_stats": {n: s.copy() for n, s in self.current_game_stats.items()}, 
+            "game_start_time": self.game_start_time
+        })
+        
+        if action == "draw":
+            self.history_console.add(f"{p.name} draws {value} cards")
+            self.session_stats[p.name]["cards"] += value
+            self.current_game_stats[p.name]["cards"] += value
         
         elif action == "win":
-            p["wins"] += value
-            self.history_console.add(f"{p['name']} wins")
-            self.session_stats[p["name"]]["wins"] += value
+            self.history_console.add(f"{p.name} wins")
+            self.session_stats[p.name]["wins"] += value
             self.game_start_time = get_ticks()
 
             # on win, reset current_game_stats counter
             self.current_game_stats = {}
             for pl in self.g.players:
-                self.current_game_stats[pl["name"]] = {"cards": 0, "wins": 0}
-        
-        self.g.playerdata_changed(p, action)
-        self._update_last_action_time()
+                self.current_game_stats[pl.name] = {"cards": 0, "wins": 0}
     
     def _display_pause_popup(self) -> None:
         self.popup = Popup(self.g, "Hey!", "Are you still playing?", ["Yes", "No"], self.pause_popup_button_handler)
@@ -1,11 +1,7 @@
 from __future__ import annotations
 from re import I
-from matplotlib.figure import Figure
 from pygame import Surface
 from tabulate import tabulate
-from PIL import Image
-import matplotlib.pyplot as plt
-import numpy as np
 from io import BytesIO
 
 from pygame.locals import *
@@ -21,6 +17,7 @@ from .components.scrollablelist import ScrollableList
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .uno import Uno
+    from matplotlib.figure import Figure
 
 class GlobalStats:
     """
@@ -38,7 +35,7 @@ class GlobalStats:
 
         self._button_names = ["Back", "Players", "By Time", "General", "Pie Chart", "Playtime"]
         for i,b in enumerate(self._button_names):
-            self.buttons.append(Button(self.g, b, (100+(i*200), 50), (200, 100), self.button_handler, FONT_LG))
+            self.buttons.append(Button(self.g, b, (100+(i*200), 50), (200, 100), self.button_handler, get_font(FONT_LG)))
         
         # get color table
         col = self.g.player_colors.copy()
@@ -54,18 +51,17 @@ class GlobalStats:
         for s in self.saves:
             
             for p in s["data"]["players"]:
-                if p["name"] not in players.keys():
-                    players[p["name"]] = {"wins": 0, "cards": 0, "playtime": 0, "games": 0}
-                if not "wins" in p.keys():
+                if p.name not in players.keys():
+                    players[p.name] = {"wins": 0, "cards": 0, "playtime": 0, "games": 0}
+                if p.wins is None:
                     cont = True
                     break
-                players[p["name"]]["wins"] += p["wins"]
-                #if "cards" in p.keys():
-                players[p["name"]]["cards"] += p["cards"]
-                players[p["name"]]["playtime"] += s["data"]["current_tick"]
+                players[p.name]["wins"] += p.wins
+                players[p.name]["cards"] += p.cards
+                players[p.name]["playtime"] += s["data"]["current_tick"]
                 for p2 in s["data"]["players"]:
-                    self.total_games += p2["wins"]
-                    players[p["name"]]["games"] += p2["wins"]
+                    self.total_games += p2.wins
+                    players[p.name]["games"] += p2.wins
             if cont:
                 cont = False
                 continue
@@ -113,32 +109,24 @@ class GlobalStats:
             "time": str(int(players[p]["playtime"]/1000/60/60*10)/10) + " h"
         } for p in players.keys()]
 
-        # get games
+        # get games, a game ends with a win of any player of the save
+        # draws at the time of a win count to the game it ends
         self.games = []
         for s in self.saves:
-            history = []
-            for p in s["data"]["players"]:
-                if "history" in p.keys():
-                    for h in p["history"]:
-                        history.append(h)
-            if len(history) == 0:
+            if sum(len(p) for p in s["data"]["players"]) == 0:
                 print("missing history " + s["filename"])
                 continue
-            if isinstance(history[0], list):
-                print("wrong format " + s["filename"])
+            if any(p.wins is None for p in s["data"]["players"]):
+                print("wrong format " + s["filename"]) # save version 0 and 1
                 continue
 
-            history = sorted(history, key=lambda x: x["time"])
-            
-            current_cards = 0
-            first_time = history[0]["time"]
-            for h in history:
-                if h["action"] == "draw":
-                    current_cards += h["value"]
-                elif h["action"] == "win":
-                    self.games.append({"time": h["time"]-first_time, "cards": current_cards})
-                    current_cards = 0
-                    first_time = h["time"]
+            indexes = [i for i in self.g.save_cache.get_history_index(f"saves/{s['filename']}").values() if len(i) > 0]
+            first_time = min(i.times[0] for i in indexes)
+            prev_time = first_time - 1 # draws at the first time belong to the first game
+            for wtime in sorted(t for i in indexes for t in i.win_times):
+                cards = sum(i.delta(prev_time, wtime)[0] for i in indexes)
+                self.games.append({"time": wtime-first_time, "cards": cards})
+                prev_time = first_time = wtime
         
         self._display_page(0)
         
@@ -197,8 +185,8 @@ class GlobalStats:
 
         if id == 0:
             self.display_mode = "lists"
-            self.list_left = ScrollableList(self.g, (50, 50), font=FONT_MONOSP, direction="bottomlast")
-            self.list_right = ScrollableList(self.g, (self.g.w//2 + 50, 50), font=FONT_MONOSP, direction="bottomlast")
+            self.list_left = ScrollableList(self.g, (50, 50), font=get_font(FONT_MONOSP), direction="bottomlast")
+            self.list_right = ScrollableList(self.g, (self.g.w//2 + 50, 50), font=get_font(FONT_MONOSP), direction="bottomlast")
             tableheader = {"name": "Name", "wins": "Wins", "cards": "Cards"}
 
             players_by_cards = tabulate(sorted(self.players_total, key=lambda x: x["cards"], reverse=True), headers=tableheader, showindex=range(1, len(self.players_total)+1)).split("\n")
@@ -213,8 +201,8 @@ class GlobalStats:
                 self.list_right.add(line)
         if id == 1:
             self.display_mode = "lists"
-            self.list_left = ScrollableList(self.g, (50, 50), font=FONT_MONOSP, direction="bottomlast")
-            self.list_right = ScrollableList(self.g, (self.g.w//2 + 50, 50), font=FONT_MONOSP, direction="bottomlast")
+            self.list_left = ScrollableList(self.g, (50, 50), font=get_font(FONT_MONOSP), direction="bottomlast")
+            self.list_right = ScrollableList(self.g, (self.g.w//2 + 50, 50), font=get_font(FONT_MONOSP), direction="bottomlast")
             tableheader = {"name": "Name", "wins": "Wins", "cards": "Cards"}
 
             players_by_cards = tabulate(sorted(self.players_by_time, key=lambda x: x["cards"], reverse=True), headers=tableheader, showindex=range(1, len(self.players_by_time)+1)).split("\n")
@@ -229,7 +217,7 @@ class GlobalStats:
                 self.list_right.add(line)
         elif id == 2:
             self.display_mode = "list"
-            self.list_left = ScrollableList(self.g, (100, 100), font=FONT_MONOSP_LARGE, direction="bottomlast")
+            self.list_left = ScrollableList(self.g, (100, 100), font=get_font(FONT_MONOSP_LARGE), direction="bottomlast")
             padlen = 35
             
             save_count = len(self.saves)
@@ -260,6 +248,9 @@ class GlobalStats:
             self.list_left.add("Total person-hours wasted".ljust(padlen) + f"{(all_players_total_time/1000/60/60):.2f} h")
             
         elif id == 3:
+            # matplotlib takes long to import, it is only needed for this page
+            import matplotlib.pyplot as plt
+            import numpy as np
             temp_players = sorted(self.players, key=lambda x: x["cards"], reverse=True)
             self.display_mode = "image"
             plt.style.use('_mpl-gallery-nogrid')
@@ -299,7 +290,7 @@ class GlobalStats:
         
         elif id == 4:
             self.display_mode = "list"
-            self.list_left = ScrollableList(self.g, (100, 100), font=FONT_MONOSP_LARGE, direction="bottomlast")
+            self.list_left = ScrollableList(self.g, (100, 100), font=get_font(FONT_MONOSP_LARGE), direction="bottomlast")
             padlen = 35
             
             tableheader = {"name": "Name", "wins": "Wins", "cards": "Cards", "time": "Time"}
@@ -312,6 +303,7 @@ class GlobalStats:
     @staticmethod
     def fig2img(fig : Figure) -> Surface:
         """Convert a Matplotlib figure to a PIL Image and and then to a pygame surface return it"""
+        from PIL import Image
         buf = BytesIO()
         fig.savefig(buf)
         buf.seek(0)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+from bisect import bisect_right
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .player import Player
+
+
+class HistoryIndex:
+    """
+    Running totals of a players history for point-in-time queries
+    Keeps a sorted time array and the cumulative cards and wins after each history entry,
+    every query is a binary search. Entries at the time of a query count as done at that time.
+    """
+    def __init__(self, player : Player = None) -> None:
+        self.times = []
+        self.cards = []
+        self.wins = []
+        self.win_times = []
+        self.win_entries = [] # entry number of each win, to drop it again on undo
+        if player is not None:
+            for i in range(len(player)):
+                self.append(player.get_action(i), player.values[i], player.times[i])
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def append(self, action : str, value : int, time : int) -> None:
+        """
+        Extend the index by a new history entry
+        :param action: "draw" or "win"
+        :param value: players total cards or wins after the action
+        :param time: game time of the action
+        """
+        cards = self.cards[-1] if len(self.cards) > 0 else 0
+        wins = self.wins[-1] if len(self.wins) > 0 else 0
+        if action == "draw":
+            cards = value
+        elif action == "win":
+            wins = value
+            self.win_times.append(time)
+            self.win_entries.append(len(self.times))
+        self.times.append(time)
+        self.cards.append(cards)
+        self.wins.append(wins)
+
+    def pop(self) -> None:
+        """
+        Remove the newest entry, used on undo
+        """
+        if len(self.times) == 0:
+            return
+        if len(self.win_entries) > 0 and self.win_entries[-1] == len(self.times) - 1:
+            self.win_times.pop()
+            self.win_entries.pop()
+        self.times.pop()
+        self.cards.pop()
+        self.wins.pop()
+
+    def cards_at(self, t : int) -> int:
+        """
+        Returns the number of cards drawn up to game time t
+        """
+        i = bisect_right(self.times, t)
+        return self.cards[i-1] if i > 0 else 0
+
+    def wins_at(self, t : int) -> int:
+        """
+        Returns the number of wins up to game time t
+        """
+        i = bisect_right(self.times, t)
+        return self.wins[i-1] if i > 0 else 0
+
+    def delta(self, t1 : int, t2 : int) -> tuple[int, int]:
+        """
+        Returns the cards and wins added after game time t1 up to t2
+        """
+        return (self.cards_at(t2) - self.cards_at(t1), self.wins_at(t2) - self.wins_at(t1))
+
+    def wins_between(self, t1 : int, t2 : int) -> int:
+        """
+        Returns the number of games won after game time t1 up to t2
+        """
+        return bisect_right(self.win_times, t2) - bisect_right(self.win_times, t1)
+
+    def cards_in_game(self, n : int) -> int:
+        """
+        Returns the cards drawn after the players win n-1 up to win n (1-based)
+        Win n+1 is the still running game, later games have no cards.
+        """
+        if n < 1 or n > len(self.win_times) + 1:
+            return 0
+        start = 0 if n == 1 else self.cards_at(self.win_times[n-2])
+        end = self.cards_at(self.win_times[n-1]) if n <= len(self.win_times) else self.cards_at(self.max_time())
+        return end - start
+
+    def max_time(self) -> int:
+        return self.times[-1] if len(self.times) > 0 else 0
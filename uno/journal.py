@@ -0,0 +1,129 @@
+from __future__ import annotations
+import json, os
+
+from .savewriter import SaveWriter
+
+class SaveJournal:
+    """
+    Append-only action journal that sits next to a savegame.
+    The savegame json acts as a snapshot, every action after it is appended as one line
+    to saves/<name>.journal and replayed on load.
+    """
+    def __init__(self, save_file_name : str, seq : int = None, snapshot_interval : int = 500, writer : SaveWriter = None) -> None:
+        self.snapshot_path = f"saves/{save_file_name}"
+        self.path = SaveJournal.get_journal_path(self.snapshot_path)
+        self.snapshot_interval = snapshot_interval
+        self.writer = SaveWriter(threaded=False) if writer is None else writer
+        self.has_snapshot = seq is not None # legacy saves need a fresh snapshot before they can be journaled
+        self.seq = 0 if seq is None else seq
+        self.entries = 0
+        if self.has_snapshot and os.path.isfile(self.path):
+            # continue numbering after the records that are already on disk
+            for record in SaveJournal.read_records(self.path):
+                self.seq = max(self.seq, record["seq"])
+                self.entries += 1
+
+    @staticmethod
+    def get_journal_path(snapshot_path : str) -> str:
+        """
+        Returns the journal path belonging to a savegame path
+        :param snapshot_path: path of the savegame json
+        """
+        return snapshot_path[:-5] + ".journal" if snapshot_path.endswith(".json") else snapshot_path + ".journal"
+
+    @staticmethod
+    def stat(snapshot_path : str) -> tuple:
+        """
+        Returns mtime and size of a savegame and its journal, changes whenever the savegame does
+        :param snapshot_path: path of the savegame json
+        """
+        st = os.stat(snapshot_path)
+        stat = (st.st_mtime_ns, st.st_size)
+        journal_path = SaveJournal.get_journal_path(snapshot_path)
+        if os.path.isfile(journal_path):
+            jst = os.stat(journal_path)
+            stat += (jst.st_mtime_ns, jst.st_size)
+        return stat
+
+    def needs_snapshot(self) -> bool:
+        """
+        Returns True if the next action should be saved by rewriting the snapshot
+        """
+        return not self.has_snapshot or self.entries + 1 >= self.snapshot_interval
+
+    def append(self, record : dict) -> None:
+        """
+        Append a single record to the journal
+        :param record: record without sequence number
+        """
+        self.seq += 1
+        self.entries += 1
+        record["seq"] = self.seq
+        self.writer.append(self.path, json.dumps(record, separators=(",", ":")) + "\n")
+
+    def snapshot_written(self) -> None:
+        """
+        Called after the snapshot has been handed to the writer, the journal records are now part of it
+        The writer removes the journal file once the snapshot is on disk
+        """
+        self.has_snapshot = True
+        self.entries = 0
+
+    #########################################################################################
+
+    @staticmethod
+    def read_records(path : str) -> list[dict]:
+        """
+        Read all complete records of a journal file
+        A torn last line (e.g. after a crash) ends the journal
+        :param path: path of the journal file
+        """
+        records = []
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+        return records
+
+    @staticmethod
+    def replay(game : dict, records : list[dict]) -> dict:
+        """
+        Apply journal records that are newer than the snapshot to the game dictionary
+        :param game: parsed savegame
+        :param records: journal records
+        """
+        seq = game.get("journal_seq")
+        if seq is None:
+            return game
+        players = {p["num"]: p for p in game["players"]}
+        for r in records:
+            if r["seq"] <= seq:
+                continue
+            p = players.get(r["num"])
+            if p is None:
+                continue
+            if r["op"] == "add":
+                p["history"].append(r["entry"])
+            elif r["op"] == "undo":
+                p["history"].pop(r["index"])
+            p["cards"] = r["cards"]
+            p["wins"] = r["wins"]
+            game["current_tick"] = r["tick"]
+            seq = r["seq"]
+        game["journal_seq"] = seq
+        return game
+
+    @staticmethod
+    def read(snapshot_path : str) -> dict:
+        """
+        Read a savegame and replay its journal if there is one
+        :param snapshot_path: path of the savegame json
+        """
+        with open(snapshot_path, "r") as f:
+            game = json.loads(f.read())
+        path = SaveJournal.get_journal_path(snapshot_path)
+        if os.path.isfile(path):
+            SaveJournal.replay(game, SaveJournal.read_records(path))
+        return game
@@ -38,15 +38,15 @@ class Load:
                 pos=(self.g.w//2, self.g.h//12 + i*self.bh), 
                 size=(self.bw, self.bh), 
                 handler=self.button_handler, 
-                font=FONT_L, 
+                font=get_font(FONT_L), 
                 subtext=", ".join(s["players"]), 
-                font_subtext=FONT_MD, 
+                font_subtext=get_font(FONT_MD), 
                 color=btncol,
                 tag=s["filename"]
                 #color=self.g.player_colors[len(s["players"])-2]
             ))
 
-        self.buttons.append(Button(self.g, name="Back", pos=(100, 50), size=(200, 100), handler=self.button_handler, font=FONT_LG))
+        self.buttons.append(Button(self.g, name="Back", pos=(100, 50), size=(200, 100), handler=self.button_handler, font=get_font(FONT_LG)))
     
     def button_handler(self, name : str) -> None:
         if name == "Back":
@@ -59,6 +59,9 @@ class Menu:
             callback=self.name_input_callback,
         )
 
+        # decode the images of the game screen while the menu is shown
+        self.g.asset_cache.preload(ASSET_PRELOAD)
+
         start_text_input()
         input_rect = Rect(80, 80, 320, 40)
         set_text_input_rect(input_rect)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+import os
+
+
+class Platform:
+    """
+    Operating system specific parts of the window setup
+    """
+    name = "sdl"
+    taskbar_height = 100 # kept free below the window
+
+    def set_dpi_aware(self) -> None:
+        """
+        Opt out of display scaling, called before pygame is initialized
+        """
+        pass
+
+    def get_screen_resolution(self) -> tuple:
+        """
+        Returns the size of the window for the primary screen, needs an initialized pygame display
+        """
+        from pygame.display import get_desktop_sizes
+        (w, h) = get_desktop_sizes()[0]
+        return (w, h - self.taskbar_height)
+
+
+class WindowsPlatform(Platform):
+    """
+    Windows, asks the Win32 API so the size is in physical pixels
+    """
+    name = "windows"
+
+    def set_dpi_aware(self) -> None:
+        import ctypes
+        ctypes.windll.user32.SetProcessDPIAware()
+
+    def get_screen_resolution(self) -> tuple:
+        import ctypes
+        return (ctypes.windll.user32.GetSystemMetrics(0), ctypes.windll.user32.GetSystemMetrics(1) - self.taskbar_height)
+
+
+class DummyPlatform(Platform):
+    """
+    Headless mode with SDL's dummy video and audio drivers, the screen has a fixed size
+    """
+    name = "dummy"
+
+    def __init__(self, resolution : tuple = (1920, 1080)) -> None:
+        self.resolution = resolution
+
+    def get_screen_resolution(self) -> tuple:
+        return self.resolution
+
+
+def enable_headless() -> None:
+    """
+    Render without a display and play sounds without an audio device
+    Has to be called before pygame is initialized, i.e. before uno.uno is imported.
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+def is_headless() -> bool:
+    return os.environ.get("SDL_VIDEODRIVER") == "dummy"
+
+
+def get_platform() -> Platform:
+    """
+    Returns the platform backend, Windows uses the Win32 API, X11, Wayland and macOS are handled by SDL
+    """
+    if is_headless():
+        return DummyPlatform()
+    if os.name == "nt":
+        return WindowsPlatform()
+    return Platform()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from array import array
+from enum import IntEnum
+
+
+class Action(IntEnum):
+    DRAW = 0
+    WIN = 1
+
+ACTION_NAMES = ["draw", "win"]
+
+
+class Player:
+    """
+    Player with a compact history
+    The history is stored column-wise in typed arrays instead of one dictionary per entry.
+    A timestamp of -1 marks entries that were saved without one (save version 1).
+    """
+    __slots__ = ("num", "name", "cards", "wins", "extra", "actions", "values", "times", "timestamps")
+
+    def __init__(self, num : int, name : str, cards : int = 0, wins : int = 0) -> None:
+        self.num = num
+        self.name = name
+        self.cards = cards
+        self.wins = wins # None for version 0 and 1 saves, which stored no wins
+        self.extra = None # unknown keys of the savegame, kept for writing it back
+        self.actions = array("b")
+        self.values = array("q")
+        self.times = array("q")
+        self.timestamps = array("q")
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def add_entry(self, action : str, value : int, time : int, timestamp : int = -1) -> None:
+        """
+        Append a history entry
+        :param action: "draw" or "win"
+        :param value: players total cards or wins after the action
+        :param time: game time of the action
+        :param timestamp: unix timestamp of the action
+        """
+        self.actions.append(Action[action.upper()])
+        self.values.append(value)
+        self.times.append(time)
+        self.timestamps.append(timestamp)
+
+    def pop_entry(self) -> None:
+        """
+        Remove the newest history entry
+        """
+        self.actions.pop()
+        self.values.pop()
+        self.times.pop()
+        self.timestamps.pop()
+
+    def get_action(self, i : int) -> str:
+        return ACTION_NAMES[self.actions[i]]
+
+    def get_entry(self, i : int) -> dict:
+        """
+        Returns a history entry in the savegame format
+        """
+        entry = {"action": ACTION_NAMES[self.actions[i]], "value": self.values[i], "time": self.times[i]}
+        if self.timestamps[i] != -1:
+            entry["timestamp"] = self.timestamps[i]
+        return entry
+
+    def copy(self) -> Player:
+        p = Player(self.num, self.name, self.cards, self.wins)
+        p.extra = self.extra
+        p.actions = array("b", self.actions)
+        p.values = array("q", self.values)
+        p.times = array("q", self.times)
+        p.timestamps = array("q", self.timestamps)
+        return p
+
+    def to_dict(self) -> dict:
+        """
+        Returns the player in the savegame format (version 2)
+        """
+        d = {"num": self.num, "name": self.name, "cards": self.cards}
+        if self.extra is not None:
+            d.update(self.extra)
+        if self.wins is not None:
+            d["wins"] = self.wins
+        d["history"] = [self.get_entry(i) for i in range(len(self.times))]
+        return d
+
+    @staticmethod
+    def from_dict(d : dict) -> Player:
+        """
+        Create a player from the savegame format (version 2)
+        """
+        p = Player(d["num"], d["name"], d["cards"], d.get("wins"))
+        p.extra = Player._get_extra(d)
+        for h in d["history"]:
+            p.add_entry(h["action"], h["value"], h["time"], h.get("timestamp", -1))
+        return p
+
+    @staticmethod
+    def from_save(game : dict) -> list[Player]:
+        """
+        Create the players of a savegame, converting older save versions
+        :param game: parsed savegame
+        """
+        if not "save_version" in game:
+            # convert save version from 0 to 1
+            players = []
+            for d in game["players"]:
+                p = Player(d["num"], d["name"], d["score"], None)
+                p.extra = Player._get_extra(d, {"flashes": 0})
+                for h in d["history"]:
+                    p.add_entry("draw", h[0], h[1])
+                players.append(p)
+            return players
+
+        if game["save_version"] == 1:
+            # convert save version from 1 to 2
+            players = []
+            for d in game["players"]:
+                p = Player(d["num"], d["name"], d["cards"], None)
+                p.extra = Player._get_extra(d)
+                for h in d["history"]:
+                    p.add_entry("win" if h["action"] == "flash" else h["action"], h["value"], h["time"])
+                players.append(p)
+            return players
+
+        return [Player.from_dict(d) for d in game["players"]]
+
+    @staticmethod
+    def _get_extra(d : dict, defaults : dict = None) -> dict:
+        """
+        Returns the keys of a savegame player that have no attribute, None if there are none
+        """
+        extra = dict(defaults or {})
+        for k, v in d.items():
+            if not k in ("num", "name", "score", "cards", "wins", "history"):
+                extra[k] = v
+        return extra if len(extra) > 0 else None
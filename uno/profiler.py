@@ -0,0 +1,101 @@
+from __future__ import annotations
+import cProfile, datetime, os, pstats
+
+
+class Profiler:
+    """
+    Profiles the main thread with cProfile between start and stop
+    On stop the profile is written as .pstats file, e.g. for snakeviz or `python -m pstats`, and as collapsed
+    stacks ("caller;callee microseconds" per line) for flamegraph.pl or speedscope.
+    cProfile only records caller -> callee edges, so the time of a function that is called from several places
+    is split between its stacks by the share of time spent in it from each caller.
+    """
+    def __init__(self, path : str = ".") -> None:
+        self.path = path
+        self.profile : cProfile.Profile = None
+        self.tags : list[str] = []
+
+    def is_running(self) -> bool:
+        return self.profile is not None
+
+    def start(self, tag : str) -> None:
+        """
+        Start profiling
+        :param tag: added to the file names, e.g. the active screen
+        """
+        if self.is_running():
+            return
+        self.tags = [tag]
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def add_tag(self, tag : str) -> None:
+        """
+        Add a tag to the file names of the running profile, e.g. when an other screen is opened
+        """
+        if self.is_running() and not tag in self.tags:
+            self.tags.append(tag)
+
+    def stop(self) -> list[str]:
+        """
+        Stop profiling and write the files
+        Returns the paths of the pstats and the collapsed stacks file.
+        """
+        if not self.is_running():
+            return []
+        self.profile.disable()
+        profile = self.profile
+        self.profile = None
+
+        name = "profile_{}_{:%Y_%m_%d-%H_%M_%S}".format("-".join(self.tags), datetime.datetime.now())
+        pstats_path = os.path.join(self.path, f"{name}.pstats")
+        collapsed_path = os.path.join(self.path, f"{name}.collapsed")
+        profile.dump_stats(pstats_path)
+        Profiler.write_collapsed(pstats.Stats(profile), collapsed_path)
+        return [pstats_path, collapsed_path]
+
+    @staticmethod
+    def write_collapsed(stats : pstats.Stats, path : str, min_us : int = 1, max_depth : int = 200) -> None:
+        """
+        Write the call graph of a profile as collapsed stacks
+        :param stats: profile
+        :param path: output file
+        :param min_us: stacks with less time are left out
+        :param max_depth: deeper stacks are cut off
+        """
+        callees = {} # func -> {callee: cumulative time of the callee when called from func}
+        for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, {})[func] = edge[3]
+        roots = [func for func, s in stats.stats.items() if len(s[4]) == 0]
+
+        lines = {}
+        def walk(func : tuple, stack : list[str], time : float) -> None:
+            (cc, nc, tt, ct, callers) = stats.stats[func]
+            stack.append(Profiler._get_label(func))
+            share = time / ct if ct > 0 else 0
+            key = ";".join(stack)
+            lines[key] = lines.get(key, 0) + tt * share
+            if len(stack) < max_depth:
+                for callee, edge_time in callees.get(func, {}).items():
+                    label = Profiler._get_label(callee)
+                    if label in stack or edge_time * share * 1_000_000 < min_us:
+                        continue # recursion is counted as time of the outer call
+                    walk(callee, stack, edge_time * share)
+            stack.pop()
+
+        for root in roots:
+            walk(root, [], stats.stats[root][3])
+
+        with open(path, "w") as f:
+            for key, time in lines.items():
+                us = int(time * 1_000_000)
+                if us >= min_us:
+                    f.write(f"{key} {us}\n")
+
+    @staticmethod
+    def _get_label(func : tuple) -> str:
+        (filename, lineno, name) = func
+        if filename == "~":
+            return name.replace(";", ",") # built-in functions, e.g. "<method 'blit' of 'pygame.surface.Surface' objects>"
+        return f"{name} ({os.path.basename(filename)}:{lineno})".replace(";", ",")
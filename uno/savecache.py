@@ -0,0 +1,92 @@
+from __future__ import annotations
+from collections import OrderedDict
+
+from .journal import SaveJournal
+from .historyindex import HistoryIndex
+from .player import Player
+
+
+class SaveCache:
+    """
+    In-process cache of parsed savegames shared by the load and global stats screens
+    Entries are keyed by (path, mtime, size) and evicted least recently used first once
+    the on-disk size of all cached savegames exceeds max_bytes.
+    The players of cached savegames are converted to Player objects, their history indexes are built on first use.
+    The returned dictionaries are shared, callers must not modify them.
+    """
+    def __init__(self, max_bytes : int = 64*1024*1024) -> None:
+        self.max_bytes = max_bytes
+        self.entries : OrderedDict[str, tuple] = OrderedDict() # path -> (stat, size, game)
+        self.indexes : dict[str, dict] = {} # path -> {player num: HistoryIndex} of cached savegames
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path : str) -> dict:
+        """
+        Returns the parsed savegame, reading it from disk only if it changed since the last call
+        Raises the same exceptions as SaveJournal.read
+        :param path: path of the savegame json
+        """
+        stat = SaveJournal.stat(path)
+        entry = self.entries.get(path)
+        if entry is not None and entry[0] == stat:
+            self.hits += 1
+            self.entries.move_to_end(path)
+            return entry[2]
+
+        self.misses += 1
+        self.invalidate(path)
+        game = SaveCache.read(path)
+        size = stat[1] + (stat[3] if len(stat) > 2 else 0)
+        if size <= self.max_bytes:
+            self.entries[path] = (stat, size, game)
+            self.total_bytes += size
+            self._evict()
+        return game
+
+    def get_history_index(self, path : str) -> dict[int, HistoryIndex]:
+        """
+        Returns the history indexes of the players of a savegame by player num, built once per cached savegame
+        :param path: path of the savegame json
+        """
+        game = self.get(path)
+        indexes = self.indexes.get(path)
+        if indexes is None:
+            indexes = {p.num: HistoryIndex(p) for p in game["players"]}
+            if path in self.entries:
+                self.indexes[path] = indexes
+        return indexes
+
+    @staticmethod
+    def read(path : str) -> dict:
+        """
+        Read a savegame and convert its players to Player objects
+        :param path: path of the savegame json
+        """
+        game = SaveJournal.read(path)
+        game["players"] = Player.from_save(game)
+        return game
+
+    def invalidate(self, path : str) -> None:
+        """
+        Drop a savegame from the cache
+        :param path: path of the savegame json
+        """
+        entry = self.entries.pop(path, None)
+        self.indexes.pop(path, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.indexes.clear()
+        self.total_bytes = 0
+
+    #########################################################################################
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and len(self.entries) > 0:
+            path, entry = self.entries.popitem(last = False)
+            self.indexes.pop(path, None)
+            self.total_bytes -= entry[1]
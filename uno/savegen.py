@@ -0,0 +1,177 @@
+"""
+Synthetic savegames for load testing, run with `python -m uno.savegen`
+Writes savegames in every format the loader understands into <out>/saves, so <out> can be used as app folder.
+The same seed and options always give the same savegames.
+"""
+from __future__ import annotations
+import json, os
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from random import Random
+
+from pygame.font import init as font_init
+font_init() # the fonts in constants need an initialized pygame font module
+
+from .components.cards import Cards
+
+DEFAULT_PLAYERS = ["Anna", "Ben", "Clara", "David", "Emma", "Felix", "Greta", "Hannes", "Ida", "Jonas"]
+SAVE_VERSIONS = [0, 1, 2]
+START_DATE = datetime(2021, 1, 1, 19, 0, 0) # first session, the following ones are a few days apart
+
+
+class SaveGenerator:
+    """
+    Deterministic generator of savegames
+    A savegame is one session of several games. In each game the players draw cards until one of them wins,
+    draws use the values of the drawing cards on the game screen and winners are picked by the win weights.
+    """
+    def __init__(self, seed : int = 0, players : list[str] = DEFAULT_PLAYERS, player_counts : tuple = (2, 6), games : tuple = (3, 15), draws : tuple = (5, 30), draw_weights : list[float] = None, win_weights : list[float] = None, action_gap : tuple = (2000, 90000)) -> None:
+        """
+        :param seed: seed of all random choices
+        :param players: pool of player names
+        :param player_counts: (min, max) players per savegame
+        :param games: (min, max) games per session
+        :param draws: (min, max) draw actions per game
+        :param draw_weights: weight of each drawing card, same order as Cards.drawing_cards
+        :param win_weights: weight of each player of the pool, higher weights win more often
+        :param action_gap: (min, max) game time between two actions in ms
+        """
+        self.seed = seed
+        self.rng = Random(seed)
+        self.players = players
+        self.player_counts = (max(2, player_counts[0]), min(len(players), player_counts[1]))
+        self.games = games
+        self.draws = draws
+        self.draw_values = [int(card[-1:]) for card in Cards().drawing_cards] # same as the card values of the game screen
+        self.draw_weights = draw_weights if draw_weights is not None else [1] * len(self.draw_values)
+        self.win_weights = dict(zip(players, win_weights if win_weights is not None else [1] * len(players)))
+        self.action_gap = action_gap
+
+    def pick_players(self) -> list[str]:
+        return self.rng.sample(self.players, self.rng.randint(*self.player_counts))
+
+    def generate_actions(self, names : list[str], count : int = None, wins : bool = True) -> list[tuple]:
+        """
+        Returns the actions of a session as (player num, action, running total, game time)
+        :param names: players of the session
+        :param count: exact number of actions, a random number of games if None
+        :param wins: include win actions, save version 0 didn't track them
+        """
+        rng = self.rng
+        cards = [0] * len(names)
+        player_wins = [0] * len(names)
+        actions = []
+        tick = 0
+        games = rng.randint(*self.games)
+        while (count is None and games > 0) or (count is not None and len(actions) < count):
+            for i in range(rng.randint(*self.draws)):
+                tick += rng.randint(*self.action_gap)
+                p = rng.randrange(len(names))
+                cards[p] += rng.choices(self.draw_values, self.draw_weights)[0]
+                actions.append((p+1, "draw", cards[p], tick))
+            if wins:
+                tick += rng.randint(*self.action_gap)
+                p = rng.choices(range(len(names)), [self.win_weights.get(n, 1) for n in names])[0]
+                player_wins[p] += 1
+                actions.append((p+1, "win", player_wins[p], tick))
+            games -= 1
+        return actions if count is None else actions[:count]
+
+    @staticmethod
+    def to_savegame(version : int, names : list[str], actions : list[tuple], start : datetime, journaled : bool = False) -> dict:
+        """
+        Returns a savegame in the format of a save version
+        :param version: 0 (score and [value, time] lists), 1 (flash actions) or 2
+        :param names: players of the session
+        :param actions: actions from generate_actions
+        :param start: date and time the session started
+        :param journaled: add the journal sequence number of saves written with an action journal, only for version 2
+        """
+        players = [{"num": i, "name": name, "cards": 0, "wins": 0, "history": []} for i, name in enumerate(names, start=1)]
+        for (num, action, value, tick) in actions:
+            p = players[num-1]
+            p["cards" if action == "draw" else "wins"] = value
+            entry = {"action": action, "value": value, "time": tick}
+            if version == 1 and action == "win":
+                entry["action"] = "flash"
+            if version == 2:
+                entry["timestamp"] = int((start - datetime(1970, 1, 1)).total_seconds()) + tick//1000 # dates are UTC, so the output doesn't depend on the time zone
+            p["history"].append(entry)
+        current_tick = actions[-1][3] if len(actions) > 0 else 0
+
+        if version == 0:
+            players = [{"num": p["num"], "name": p["name"], "score": p["cards"], "history": [[h["value"], h["time"]] for h in p["history"] if h["action"] == "draw"]} for p in players]
+            return {"current_tick": current_tick, "players": players}
+        if version == 1:
+            for p in players:
+                p["flashes"] = p.pop("wins")
+            return {"current_tick": current_tick, "players": players, "save_version": 1}
+        game = {"current_tick": current_tick, "players": players, "save_version": 2}
+        if journaled:
+            game["journal_seq"] = 0
+        return game
+
+    def make_savegame(self, version : int, names : list[str] = None, count : int = None, start : datetime = START_DATE, journaled : bool = False) -> dict:
+        """
+        Returns a savegame of one session
+        :param version: save version
+        :param names: players, picked from the pool if None
+        :param count: exact number of history entries
+        :param start: date and time the session started
+        :param journaled: version 2 in the format written with an action journal
+        """
+        if names is None:
+            names = self.pick_players()
+        return SaveGenerator.to_savegame(version, names, self.generate_actions(names, count, version > 0), start, journaled)
+
+    def write_corpus(self, path : str, count : int, versions : list[int] = SAVE_VERSIONS, journaled : bool = False) -> list[str]:
+        """
+        Write count savegames of each version to <path>/saves, older versions get older dates
+        Returns the file names.
+        :param journaled: write version 2 in the format written with an action journal
+        """
+        saves_dir = os.path.join(path, "saves")
+        os.makedirs(saves_dir, exist_ok=True)
+        filenames = []
+        day = START_DATE
+        for version in sorted(versions):
+            for i in range(count):
+                day += timedelta(days=self.rng.randint(1, 14))
+                start = day + timedelta(minutes=self.rng.randint(-120, 120))
+                filename = "savegame_{:%Y_%m_%d-%H_%M_%S}.json".format(start)
+                with open(os.path.join(saves_dir, filename), "w") as f:
+                    f.write(json.dumps(self.make_savegame(version, start=start, journaled=journaled)))
+                filenames.append(filename)
+        return filenames
+
+
+def parse_range(s : str) -> tuple:
+    """
+    Parse "min-max" or a single number
+    """
+    parts = [int(x) for x in s.split("-")]
+    return (parts[0], parts[-1])
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Write synthetic savegames for load testing")
+    parser.add_argument("--out", help="Folder to write the savegames to, they are put in its saves folder", default="corpus")
+    parser.add_argument("--count", help="Savegames per save version", type=int, default=100)
+    parser.add_argument("--versions", help="Save versions to write", type=int, nargs="+", default=SAVE_VERSIONS, choices=SAVE_VERSIONS)
+    parser.add_argument("--seed", help="Seed of the random generator", type=int, default=0)
+    parser.add_argument("--players", help="Pool of player names", nargs="+", default=DEFAULT_PLAYERS)
+    parser.add_argument("--player-count", help="Players per savegame, e.g. 2-6", type=parse_range, default=(2, 6))
+    parser.add_argument("--games", help="Games per session, e.g. 3-15", type=parse_range, default=(3, 15))
+    parser.add_argument("--draws", help="Draw actions per game, e.g. 5-30", type=parse_range, default=(5, 30))
+    parser.add_argument("--draw-weights", help="Weight of each drawing card, in the order of the game screen", type=float, nargs="+")
+    parser.add_argument("--win-weights", help="Weight of each player of the pool, higher weights win more often", type=float, nargs="+")
+    parser.add_argument("--journaled", help="Write version 2 savegames like the current app, with a journal sequence number", action="store_true")
+    args = parser.parse_args()
+
+    if args.win_weights is not None and len(args.win_weights) != len(args.players):
+        parser.error("--win-weights needs one weight per player")
+    generator = SaveGenerator(args.seed, args.players, args.player_count, args.games, args.draws, args.draw_weights, args.win_weights)
+    if len(generator.draw_weights) != len(generator.draw_values):
+        parser.error(f"--draw-weights needs {len(generator.draw_values)} weights")
+    filenames = generator.write_corpus(args.out, args.count, args.versions, args.journaled)
+    print(f"wrote {len(filenames)} savegames to {os.path.join(args.out, 'saves')}")
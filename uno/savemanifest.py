@@ -0,0 +1,107 @@
+from __future__ import annotations
+import json, os
+
+from .journal import SaveJournal
+from .savecache import SaveCache
+
+
+class SaveManifest:
+    """
+    On-disk index of savegame summaries used by the load screen
+    Entries are keyed by filename and only re-parsed when mtime or size of the savegame or its journal changed
+    """
+    version = 1
+
+    def __init__(self, path : str = "saves_manifest.json", saves_dir : str = "saves", cache : SaveCache = None) -> None:
+        self.path = path
+        self.saves_dir = saves_dir
+        self.cache = cache
+        self.entries = {}
+        self.changed = False
+        self._read()
+
+    def get_saves_info(self) -> list[dict]:
+        """
+        Returns the summaries of all savegames, newest title first
+        """
+        if not os.path.isdir(self.saves_dir):
+            return []
+
+        savegames = []
+        seen = set()
+        for filename in os.listdir(self.saves_dir):
+            if not filename.endswith(".json"):
+                continue
+            seen.add(filename)
+            stat = list(SaveJournal.stat(f"{self.saves_dir}/{filename}"))
+            entry = self.entries.get(filename)
+            if entry is None or entry["stat"] != stat:
+                entry = self._parse(filename, stat)
+                self.entries[filename] = entry
+                self.changed = True
+
+            if "error" in entry:
+                print(f"Error loading file '{filename}': {entry['error']}")
+                continue
+            savegames.append(entry["info"])
+
+        # forget deleted savegames
+        for filename in list(self.entries.keys()):
+            if not filename in seen:
+                del self.entries[filename]
+                self.changed = True
+
+        if self.changed:
+            self._write()
+        return sorted(savegames, key = lambda x: x["title"], reverse = True)
+
+    @staticmethod
+    def get_save_info(filename : str, game : dict) -> dict:
+        """
+        Build the load screen summary of a savegame
+        :param filename: name of the savegame
+        :param game: parsed savegame with Player objects
+        """
+        players = []
+        total_cards = 0
+        total_games = 0
+        for p in game["players"]:
+            if p.wins is None:
+                raise ValueError(f"player '{p.name}' has no wins (save version 0 or 1)")
+            players.append(f"{p.name} ({p.cards} / {p.wins})")
+            total_cards += p.cards
+            total_games += p.wins
+        if filename.startswith("savegame_"):
+            titleparts = filename[len("savegame_"):-5].split("-")
+            savetitle = f"{titleparts[0].replace('_', '-')} {titleparts[1].replace('_', ':')}"
+        else:
+            savetitle = filename[:-5]
+        return {"filename": filename, "players": players, "title": f"{savetitle} ({total_cards} / {total_games})"}
+
+    #########################################################################################
+
+    def _parse(self, filename : str, stat : list[int]) -> dict:
+        try:
+            path = f"{self.saves_dir}/{filename}"
+            game = SaveCache.read(path) if self.cache is None else self.cache.get(path)
+            return {"stat": stat, "info": SaveManifest.get_save_info(filename, game)}
+        except Exception as e:
+            return {"stat": stat, "error": str(e)}
+
+    def _read(self) -> None:
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                manifest = json.loads(f.read())
+            if manifest.get("version") == SaveManifest.version:
+                self.entries = manifest["entries"]
+        except Exception as e:
+            print(f"Error loading save manifest '{self.path}': {e}")
+
+    def _write(self) -> None:
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps({"version": SaveManifest.version, "entries": self.entries}))
+        os.replace(tmp_path, self.path)
+        self.changed = False
@@ -0,0 +1,148 @@
+from __future__ import annotations
+import json, os
+from collections import deque
+from threading import Thread, Condition
+
+
+class SaveWriter:
+    """
+    Writes savegames and journal records on a background thread, so disk stalls don't block the render loop
+    Jobs are executed in the order they were queued, a queued snapshot that hasn't been written yet
+    is replaced by newer snapshots of the same savegame (coalescing).
+    Snapshots are written to a temporary file first and then moved over the savegame.
+    """
+    def __init__(self, threaded : bool = True) -> None:
+        self.threaded = threaded
+        self.jobs = deque()
+        self.pending_snapshots = {} # path -> queued snapshot job
+        self.files = {} # path -> open journal file
+        self.cond = Condition()
+        self.busy = False
+        self.thread = None
+
+        # counters
+        self.queued = 0
+        self.coalesced = 0
+        self.written = 0
+        self.appended = 0
+
+    def write_snapshot(self, path : str, game : dict, journal_path : str = None) -> None:
+        """
+        Queue a savegame to be written
+        :param path: path of the savegame json
+        :param game: savegame dictionary, must not be modified afterwards
+        :param journal_path: journal that is part of the snapshot and gets removed after writing
+        """
+        self.queued += 1
+        if not self.threaded:
+            self._run(["snapshot", path, game, journal_path])
+            return
+
+        with self.cond:
+            job = self.pending_snapshots.get(path)
+            if job is not None:
+                job[2] = game
+                self.coalesced += 1
+                return
+            job = ["snapshot", path, game, journal_path]
+            self.pending_snapshots[path] = job
+            self._queue(job)
+
+    def append(self, path : str, line : str) -> None:
+        """
+        Queue a line to be appended to a journal
+        :param path: path of the journal
+        :param line: line including the line break
+        """
+        if not self.threaded:
+            self._run(["append", path, line])
+            return
+
+        with self.cond:
+            self._queue(["append", path, line])
+
+    def flush(self) -> None:
+        """
+        Blocks until all queued jobs are written
+        """
+        if not self.threaded:
+            return
+        with self.cond:
+            while len(self.jobs) > 0 or self.busy:
+                self.cond.wait()
+
+    def close(self) -> None:
+        """
+        Write all queued jobs and close the open journal files
+        """
+        self.flush()
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+
+    def get_counters(self) -> dict:
+        return {"queued": self.queued, "coalesced": self.coalesced, "written": self.written, "appended": self.appended}
+
+    #########################################################################################
+
+    @staticmethod
+    def _to_json(o : object) -> dict:
+        """
+        Serializes objects like Player that know their savegame format
+        """
+        if hasattr(o, "to_dict"):
+            return o.to_dict()
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    def _queue(self, job : list) -> None:
+        self.jobs.append(job)
+        if self.thread is None:
+            self.thread = Thread(target=self._worker, name="SaveWriter", daemon=True)
+            self.thread.start()
+        self.cond.notify_all()
+
+    def _worker(self) -> None:
+        while True:
+            with self.cond:
+                while len(self.jobs) == 0:
+                    self.cond.wait()
+                job = self.jobs.popleft()
+                if job[0] == "snapshot":
+                    del self.pending_snapshots[job[1]]
+                self.busy = True
+
+            try:
+                self._run(job)
+            except Exception as e:
+                print(f"Error writing '{job[1]}': {e}")
+
+            with self.cond:
+                self.busy = False
+                self.cond.notify_all()
+
+    def _run(self, job : list) -> None:
+        if job[0] == "snapshot":
+            _, path, game, journal_path = job
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write(json.dumps(game, default=SaveWriter._to_json))
+            os.replace(tmp_path, path)
+            self.written += 1
+
+            # the journal records are part of the snapshot now
+            if journal_path is not None:
+                f = self.files.pop(journal_path, None)
+                if f is not None:
+                    f.close()
+                if os.path.isfile(journal_path):
+                    os.remove(journal_path)
+
+        elif job[0] == "append":
+            _, path, line = job
+            f = self.files.get(path)
+            if f is None:
+                f = open(path, "a")
+                self.files[path] = f
+            f.write(line)
+            f.flush()
+            self.appended += 1
@@ -32,7 +32,7 @@ class Stats:
         self.bh = self.g.h//8
         self.img = Surface((int(self.g.w*0.93), int(self.g.h*0.86)))
         self.img.fill(BLACK)
-        self.buttons = [Button(self.g, "Back", (100, 50), (200, 100), self.button_handler, FONT_LG)]
+        self.buttons = [Button(self.g, "Back", (100, 50), (200, 100), self.button_handler, get_font(FONT_LG))]
         self.w, self.h = self.img.get_size()
         self.bottom_margin = 50
 
@@ -40,10 +40,10 @@ class Stats:
         max_time = 0
         max_cards = 0
         for p in self.g.players:
-            if p["history"][-1]["time"] > max_time:
-                max_time = p["history"][-1]["time"]
-            if p["cards"] > max_cards:
-                max_cards = p["cards"]
+            max_time = max(max_time, self.g.get_history_index(p).max_time())
+            max_cards = max(max_cards, p.cards)
+        max_time = max(max_time, 1)
+        max_cards = max(max_cards, 1)
             
         # graph scale
         tickmult = self.w/max_time
@@ -53,7 +53,7 @@ class Stats:
         player_markers = []
         for p in self.g.players:
             obj = {
-                "color": self.g.player_colors[p["num"]], 
+                "color": self.g.player_colors[p.num], 
                 "waypoints": [
                     {
                         "pos": (0, self.h-self.bottom_margin), 
@@ -64,17 +64,16 @@ class Stats:
 
             # create paths
             prev_pos = obj["waypoints"][0]["pos"]
-            curr_cards = 0
-            for h in p["history"]:
-                if h["action"] == "draw":
-                    curr_cards += h["value"]
+            index = self.g.get_history_index(p)
+            for i in range(len(p)):
+                curr_cards = index.cards[i]
 
                 pos = (
-                    int(h["time"] * tickmult), 
+                    int(p.times[i] * tickmult), 
                     int(self.h - self.bottom_margin - curr_cards*scoremult)
                 )
 
-                obj["waypoints"].append({"pos": pos, "action": h["action"]})
+                obj["waypoints"].append({"pos": pos, "action": p.get_action(i)})
                 
             player_markers.append(deepcopy(obj))
         
@@ -105,7 +104,7 @@ class Stats:
         for i in range(0, max_cards, hstepsize):
             ypos = self.h-self.bottom_margin-i*scoremult
             line(self.img, WHITE, (0, ypos), (self.w, ypos), self.stroke_width//2)
-            self.g.blit_aligned(FONT_MD.render(str(i*hstepsize), True, WHITE), (50, ypos-10))
+            self.g.blit_aligned(get_font(FONT_MD).render(str(i*hstepsize), True, WHITE), (50, ypos-10))
         line(self.img, WHITE, (0, 0), (self.w, 0), self.stroke_width//2)
 
         minute_mark_interval = 30
@@ -124,10 +123,10 @@ class Stats:
             line(self.img, WHITE, (xpos, 0), (xpos, self.h-self.bottom_margin), self.stroke_width//2)
             if i == 0: # move first number a little to the right
                 xpos += 20
-            self.g.blit_aligned(FONT_MD.render(str(i*minute_mark_interval), True, WHITE), (xpos, self.h-30), self.img)
+            self.g.blit_aligned(get_font(FONT_MD).render(str(i*minute_mark_interval), True, WHITE), (xpos, self.h-30), self.img)
         # move last number a little to the left
         line(self.img, WHITE, (self.w-self.stroke_width//2, 0), (self.w-self.stroke_width//2, self.h-self.bottom_margin), self.stroke_width//2)
-        self.g.blit_aligned(FONT_MD.render(str(round(max_time/1000/60, 1)), True, WHITE), (self.w-20, self.h-30), self.img)
+        self.g.blit_aligned(get_font(FONT_MD).render(str(round(max_time/1000/60, 1)), True, WHITE), (self.w-20, self.h-30), self.img)
         
     
     def button_handler(self, name : str) -> None:
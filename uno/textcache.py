@@ -0,0 +1,47 @@
+from __future__ import annotations
+from collections import OrderedDict
+
+from pygame import Surface
+from pygame.font import Font
+
+
+class TextCache:
+    """
+    Cache of rendered text surfaces
+    Entries are keyed by (font, text, color, antialias) and evicted least recently used first
+    once more than max_entries surfaces are cached.
+    The returned surfaces are shared, callers must not draw onto them.
+    """
+    def __init__(self, max_entries : int = 512) -> None:
+        self.max_entries = max_entries
+        self.entries : OrderedDict[tuple, Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font : Font, text : str, color : tuple, antialias : bool = True) -> Surface:
+        """
+        Returns the rendered text, rendering it only if it isn't cached
+        :param font: font to render with
+        :param text: text to render
+        :param color: text color
+        :param antialias: render with antialiasing
+        """
+        key = (font, text, tuple(color), antialias)
+        img = self.entries.get(key)
+        if img is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return img
+
+        self.misses += 1
+        img = font.render(text, antialias, color)
+        self.entries[key] = img
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last = False)
+        return img
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def get_counters(self) -> dict:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
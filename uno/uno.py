@@ -1,36 +1,41 @@
 from __future__ import annotations
-import json, os, datetime
+import os, datetime
 from random import seed
 from time import time
 from os.path import join, dirname, realpath
-import ctypes
-from tkinter.messagebox import NO
 from typing import Optional
 
-from pygame import Surface, quit as pygame_quit, init as pygame_init
+from pygame import Surface, Rect, quit as pygame_quit, init as pygame_init
 from pygame.display import set_mode, set_caption, get_surface, update as display_update
-from pygame.event import Event, get as get_events
-from pygame.font import SysFont, init as font_init
+from pygame.event import Event, get as get_events, wait as wait_event
+from pygame.font import Font, init as font_init
 from pygame.mixer import init as mixer_init, Sound
 from pygame.time import Clock, get_ticks
-from pygame.image import load as load_image
-from pygame.transform import scale
 
-from pygame.mouse import get_pos as get_mouse_pos
 from pygame.key import get_mods as get_key_mods
 from pygame.locals import *
 
-ctypes.windll.user32.SetProcessDPIAware()
+from .platforms import get_platform
+
+PLATFORM = get_platform()
+PLATFORM.set_dpi_aware()
 
 pygame_init()
 mixer_init()
 font_init()
 
 from .menu import Menu
-from .game import Game
-from .load import Load
-from .stats import Stats
-from .globalstats import GlobalStats
+from .journal import SaveJournal
+from .savemanifest import SaveManifest
+from .savecache import SaveCache
+from .savewriter import SaveWriter
+from .historyindex import HistoryIndex
+from .player import Player
+from .textcache import TextCache
+from .assetcache import AssetCache
+from .frametimer import FrameTimer
+from .components.dirtyrects import DirtyRects
+from .components.cardcache import CardCache
 from .constants import *
 
 
@@ -40,7 +45,7 @@ class Uno:
     """
     def __init__(self, fullscreen : bool = False) -> None:
         seed(int(time()))
-        self.true_res = Uno._os_get_screen_resolution()
+        self.true_res = PLATFORM.get_screen_resolution()
         flags = 0
         if fullscreen:
             flags = FULLSCREEN
@@ -50,7 +55,7 @@ class Uno:
         self.appfolder = Uno.get_app_folder()
         self.assets_dir = join(dirname(realpath(__file__)), "../assets")
 
-        self.screens = [Menu(self), Game(self), Load(self), Stats(self), GlobalStats(self)]
+        self.screens = [Menu(self), None, None, None, None] # the other screens are created on first use, see get_screen
 
         # init vars
         self.fps = 60
@@ -58,18 +63,35 @@ class Uno:
         self.state = 0
         self.save_file_name = None
         self.save_version = None # gets set on load or new game
+        self.save_mode = SAVE_MODE
+        self.journal = None
+        self.save_manifest = None
+        self.save_cache = SaveCache(SAVE_CACHE_MAX_BYTES)
+        self.save_writer = SaveWriter(SAVE_WRITER_THREAD)
+        self.text_cache = TextCache(TEXT_CACHE_MAX_ENTRIES)
+        self.card_cache = CardCache(CARD_CACHE_DIR)
+        self.asset_cache = AssetCache(self.assets_dir, ASSET_CACHE_MAX_ENTRIES)
+        self.frame_timer = FrameTimer(FRAME_TIMER_MAX_FRAMES)
+        self.frame_overlay = None # shown while frames are timed, see toggle_frame_timer
+        self.profiler = None # created on first use, see toggle_profiler
         self.debug = DEBUG
 
         self.players = []
+        self.actions : list[Player] = [] # global action log for undo, player of each action, newest last
+        self.redo_actions = []
+        self.history_index = {} # player num -> HistoryIndex
         self.pcount = 0
+        self.game_id = 0 # increased for every started or loaded game, screens use it to detect an other game
         self.ticks_start = 0
-        self.player_colors = [(255, 255, 255), (255, 0, 0), (0, 255, 0), (0x3f, 0xab, 0xda), (0x77, 0x00, 0xff), (255, 255, 0), (255, 0, 255), (0, 255, 255)]
+        self.player_colors = [(255, 255, 255), (255, 0, 0), (0, 255, 0), (0x3f, 0xab, 0xda), (0x77, 0x00, 0xff), (255, 255, 0), (255, 0, 255), (0, 255, 255), (255, 0x80, 0)]
         
         self.w = 0
         self.h = 0
         self.bg = None
+        self.dirty = DirtyRects(self.true_res) # changed regions of screens that support dirty rect rendering
+        self.update_rects = None # regions passed to display_update in this frame, None for the whole window
         self._screen_resolution_changed()
-        self.screens[self.state].setup()
+        self._enter_screen(self.get_screen(self.state))
     
     @staticmethod
     def get_app_folder() -> str:
@@ -95,106 +117,210 @@ class Uno:
     def main_loop(self):
         self.run = True
         while self.run:
-            self.clock.tick(self.fps)
-            screen = self.screens[self.state]
-            events = get_events()
+            events = self._wait_for_frame(self.get_screen(self.state))
+            self.run_frame(events)
+    
+    def run_frame(self, events : list[Event]) -> None:
+        """
+        Handle the events of one frame and draw it
+        Also used to drive the screens with synthetic events in headless mode.
+        :param events: events of this frame
+        """
+        screen = self.get_screen(self.state)
+        self.update_rects = None
+        timer = self.frame_timer
+        timer.begin_frame()
+        if self.frame_overlay is not None:
+            self.invalidate(self.frame_overlay.get_rect()) # the overlay is translucent, the screen below it has to be drawn again
+        
+        with timer.measure("events"):
             for e in events:
                 # event handler
                 if e.type == QUIT:
                     self.exit()
                 elif e.type == KEYDOWN:
                     kmods = get_key_mods()
-                    if not screen.keydown(e.key, kmods):
+                    if e.key == K_p and kmods & KMOD_CTRL and kmods & KMOD_SHIFT:
+                        self.toggle_profiler() # handled before the screens, so it works while typing names too
+                    elif not screen.keydown(e.key, kmods):
                         self.keydown(e.key, kmods)
                 elif e.type in [MOUSEBUTTONDOWN, MOUSEBUTTONUP, MOUSEMOTION]:
                     if screen.mouse_event(e):
                         continue
-                    
+                
                     if e.type == MOUSEBUTTONUP:
-                        pos = get_mouse_pos()
-                        if screen.click(pos, e.button):
+                        if screen.click(e.pos, e.button):
                             continue
                 elif e.type == VIDEORESIZE:
                     self._screen_resolution_changed()
-            
+                    if hasattr(screen, "resize"):
+                        screen.resize() # only the layout, the screens state is kept
+        
+        with timer.measure("screen"):
             self.loop(events)
             screen.loop(events)
-            display_update()
+        if self.frame_overlay is not None:
+            with timer.measure("overlay"):
+                self.frame_overlay.draw()
+                rect = self.frame_overlay.get_rect()
+                if self.update_rects is not None and not any(r.contains(rect) for r in self.update_rects):
+                    self.update_rects.append(rect) # its size changed after the screen was drawn
+        
+        with timer.measure("display update"):
+            if self.update_rects is None:
+                display_update()
+            else:
+                display_update(self.update_rects)
+        timer.end_frame()
+    
+    def _wait_for_frame(self, screen : object) -> list[Event]:
+        """
+        Waits until the next frame is due and returns its events
+        Screens that implement get_idle_timeout are only redrawn when an event arrives or their timeout expires,
+        all other screens are redrawn at full frame rate.
+        """
+        timeout = 0
+        if IDLE_FRAME_SCHEDULER and hasattr(screen, "get_idle_timeout") and not self.dirty.is_pending():
+            timeout = screen.get_idle_timeout()
+        
+        if timeout == 0:
+            self.clock.tick(self.fps)
+            return get_events()
+        
+        # sleep until something happens
+        e = wait_event() if timeout is None else wait_event(timeout)
+        self.clock.tick(self.fps) # limits the frame rate during bursts of input events
+        events = get_events()
+        if e.type != NOEVENT:
+            events.insert(0, e)
+        return events
     
     def undo(self) -> Optional[tuple]:
         """
         Undo the last player action
-        Returns a tuple consisting of (player, action, value) on success, None on failure
+        Returns a tuple consisting of (player, action, value, time) on success, None on failure
         """
-        last_value = 0
-        last_time = 0
-        last_index = 0
-        last_player = None
-        last_action = None
-        for p in self.players:
-            if len(p["history"]) == 0:
-                continue
-            htime = p["history"][-1]["time"]
-            if htime > last_time:
-                last_time = htime
-                last_player = p
-                last_action = p["history"][-1]["action"]
-            
-        if not last_player:
+        if len(self.actions) == 0:
             print("No undoable action")
             return None
         
-        sum_actions = 0
-        tmp = 0
-        for i,h in enumerate(last_player["history"]):
-            if h["action"] == last_action:
-                last_value = tmp
-                sum_actions += 1
-                tmp = h["value"]
-                last_index = i
+        p = self.actions.pop()
+        i = len(p) - 1 # the newest action is always the last history entry of its player
+        action = p.get_action(i)
+        action_time = p.times[i]
+        
+        # restore the previous total from the history index
+        index = self.history_index[p.num]
+        key = Uno._get_action_key(action)
+        totals = index.wins if action == "win" else index.cards
+        prev_value = totals[i-1] if i > 0 else 0
+        change = getattr(p, key) - prev_value
+        setattr(p, key, prev_value)
         
-        if sum_actions > 1:
-            if last_action == "win":
-                change = last_player["wins"] - last_value
-                last_player["wins"] = last_value
-            elif last_action == "draw":
-                change = last_player["cards"] - last_value
-                last_player["cards"] = last_value
-        elif sum_actions == 1:
-            if last_action == "draw":
-                change = last_player["cards"]
-                last_player["cards"] = 0
-            elif last_action == "win":
-                change = last_player["wins"]
-                last_player["wins"] = 0
-        last_player["history"].pop(last_index)
-        return (last_player["name"], last_action, change)
+        p.pop_entry()
+        index.pop()
+        self.redo_actions.append((p, action, change))
+        self._save_action({"op": "undo", "num": p.num, "index": i}, p)
+        return (p, action, change, action_time)
+    
+    def redo(self) -> Optional[tuple]:
+        """
+        Redo the last undone player action
+        Returns a tuple consisting of (player, action, value, time) on success, None on failure
+        """
+        if len(self.redo_actions) == 0:
+            print("No redoable action")
+            return None
+        
+        p, action, change = self.redo_actions.pop()
+        key = Uno._get_action_key(action)
+        setattr(p, key, getattr(p, key) + change)
+        self._add_history_entry(p, action)
+        return (p, action, change, p.times[-1])
     
     def setstate(self, num : int) -> None:
         """
         Set the screen state of the game
         :param num: screen number
         """
+        screen = self.screens[self.state]
+        if hasattr(screen, "exit"):
+            screen.exit()
+        
         self.state = num
         if self.state >= len(self.screens):
             self.state = 0
         if self.state < 0:
             self.state = len(self.screens) - 1
-        self.screens[self.state].setup()
+        self.invalidate()
+        if self.profiler is not None:
+            self.profiler.add_tag(self._get_screen_name(self.state))
+        self._enter_screen(self.get_screen(self.state))
+    
+    def get_screen(self, num : int) -> object:
+        """
+        Returns a screen, it is imported and created when it is used for the first time
+        This keeps heavy dependencies of single screens (e.g. matplotlib) out of the startup time.
+        :param num: screen number
+        """
+        screen = self.screens[num]
+        if screen is None:
+            screen = self._create_screen(num)
+            self.screens[num] = screen
+        return screen
+    
+    def _enter_screen(self, screen : object) -> None:
+        """
+        Screens with an enter hook decide themselves what to rebuild, all other screens are set up again
+        """
+        if hasattr(screen, "enter"):
+            screen.enter()
+        else:
+            screen.setup()
+    
+    def _get_screen_name(self, num : int) -> str:
+        return type(self.get_screen(num)).__name__.lower()
+    
+    def _create_screen(self, num : int) -> object:
+        if num == 1:
+            from .game import Game
+            return Game(self)
+        if num == 2:
+            from .load import Load
+            return Load(self)
+        if num == 3:
+            from .stats import Stats
+            return Stats(self)
+        if num == 4:
+            from .globalstats import GlobalStats
+            return GlobalStats(self)
+        return Menu(self)
+    
+    def invalidate(self, rect : Rect = None) -> None:
+        """
+        Mark a region of the window as changed
+        Only used by screens with dirty rect rendering, the other screens redraw everything each frame
+        :param rect: changed region, None to redraw the whole window
+        """
+        self.dirty.invalidate(rect)
+    
+    def begin_dirty_frame(self) -> Optional[list[Rect]]:
+        """
+        Called by screens with dirty rect rendering before drawing
+        Returns the regions to redraw, None if the whole window has to be redrawn
+        """
+        if not DIRTY_RECT_RENDERING:
+            self.dirty.invalidate()
+        self.update_rects = self.dirty.begin_frame()
+        return self.update_rects
     
     def load_asset_image(self, imgname : str, rescale : float = None) -> Surface:
         """
-        Load an image from the assets folder
+        Load an image from the assets folder, images are cached and must not be drawn onto
         :param imgname: name of the image
         :param rescale: rescale the image to this size
         """
-        img = load_image(join(self.assets_dir, imgname)).convert_alpha()
-        
-        if not rescale is None:
-            imsize = img.get_size()
-            img = scale(img, (int(imsize[0]*rescale), int(imsize[1]*rescale)))
-        
-        return img
+        return self.asset_cache.get_image(imgname, rescale)
     
     def check_collision_center(self, center_pos : tuple, area_size : tuple, touch_pos : tuple) -> bool:
         """
@@ -216,11 +342,62 @@ class Uno:
     #########################################################################################
 
     def loop(self, events : list[Event]) -> None:
-        self.window.blit(self.bg, (0, 0))
+        if not getattr(self.get_screen(self.state), "dirty_rendering", False):
+            self.window.blit(self.bg, (0, 0))
     
     def keydown(self, k : int, kmods : int) -> None:
         if k == K_ESCAPE or k == K_q:
             self.exit()
+        elif k == K_F3:
+            self.toggle_frame_timer()
+        elif k == K_F4:
+            self.write_frame_log()
+    
+    def toggle_frame_timer(self) -> None:
+        """
+        Start timing frames and show the overlay, or stop and hide it
+        The timed frames are kept until the timer is started again.
+        """
+        self.frame_timer.enabled = not self.frame_timer.enabled
+        if self.frame_timer.enabled:
+            from .components.frameoverlay import FrameOverlay # imports tabulate, which isn't needed for the first frame
+            self.frame_timer.clear()
+            self.frame_overlay = FrameOverlay(self)
+        else:
+            self.invalidate(self.frame_overlay.get_rect())
+            self.frame_overlay = None
+    
+    def toggle_profiler(self) -> Optional[list[str]]:
+        """
+        Start profiling the main loop, or stop and write the profile to the app folder
+        The file names are tagged with the screens that were shown while profiling.
+        Returns the written files when stopping.
+        """
+        if self.profiler is None:
+            from .profiler import Profiler
+            self.profiler = Profiler(self.appfolder)
+        
+        if not self.profiler.is_running():
+            print("profiling, press Ctrl+Shift+P again to stop")
+            self.profiler.start(self._get_screen_name(self.state))
+            return None
+        paths = self.profiler.stop()
+        for path in paths:
+            print(f"wrote {path}")
+        return paths
+    
+    def write_frame_log(self) -> Optional[str]:
+        """
+        Write the timed frames to a csv file in the app folder
+        Returns the file name, None if no frames were timed.
+        """
+        if len(self.frame_timer.frames) == 0:
+            print("No timed frames, press F3 to start the frame timer")
+            return None
+        filename = "frames_{:%Y_%m_%d-%H_%M_%S}.csv".format(datetime.datetime.now())
+        self.frame_timer.write_csv(filename)
+        print(f"wrote {len(self.frame_timer.frames)} frames to {join(self.appfolder, filename)}")
+        return filename
     
     #########################################################################################
 
@@ -234,77 +411,46 @@ class Uno:
             return
         self.save_version = 2
         
-        self.players = []
-        for i,p in enumerate(playernames, start = 1):
-            self.players.append({
-                "num": i,
-                "name": p,
-                "cards": 0,
-                #"flashes": 0,
-                "wins": 0,
-                "history": [],
-            })
+        self.players = [Player(i, p) for i,p in enumerate(playernames, start = 1)]
         self.pcount = len(self.players)
+        self.actions = []
+        self.redo_actions = []
+        self.history_index = {p.num: HistoryIndex() for p in self.players}
+        self.game_id += 1
         self.ticks_start = get_ticks()
         self.playerdata_changed(None)
         
         datestr = "{:%Y_%m_%d-%H_%M_%S}".format(datetime.datetime.now())
         self.save_file_name = f"savegame_{datestr}.json"
+        self._open_journal(None)
     
-    def get_saves_info(self):
+    def get_saves_info(self) -> list[dict]:
         """
-        Load all savegames from the savegame folder
+        Returns the load screen summaries of all savegames
+        Served from the save manifest, only changed savegames are parsed again
         """
-
-        if not os.path.isdir("saves"):
-            return []
-        
-        savefiles = sorted(os.listdir("saves"), reverse = True)
-        savegames = []
-        for filename in savefiles:
-            if not filename.endswith(".json"):
-                continue
-            try:
-                with open(f"saves/{filename}", "r") as f:
-                    game = json.loads(f.read())
-                    players = []
-                    total_cards = 0
-                    total_games = 0
-                    for p in game["players"]:
-                        #if not "cards" in p:
-                        #    players.append(f"{p['name']} ({p['score']} cards)")
-#
-                        #else:
-                        players.append(f"{p['name']} ({p['cards']} / {p['wins']})")
-                        total_cards += p["cards"]
-                        total_games += p["wins"]
-                    if filename.startswith("savegame_"):
-                        titleparts = filename[len("savegame_"):-5].split("-")
-                        savetitle = f"{titleparts[0].replace('_', '-')} {titleparts[1].replace('_', ':')}"
-                    else:
-                        savetitle = filename[:-5]
-                    savegames.append({"filename": filename, "players": players, "title": f"{savetitle} ({total_cards} / {total_games})"})
-            except Exception as e:
-                print(f"Error loading file '{filename}': {e}")
-            savegames = sorted(savegames, key = lambda x: x["title"], reverse = True)
-        return savegames
+        if self.save_manifest is None:
+            self.save_manifest = SaveManifest(cache=self.save_cache)
+        self.save_writer.flush()
+        return self.save_manifest.get_saves_info()
         
-    def get_saves(self):
+    def get_saves(self) -> list[dict]:
         """
         Load all savegames from the savegame folder and return a list
+        Parsed savegames are shared with the save cache and must not be modified
         """
         if not os.path.isdir("saves"):
             return []
         
+        self.save_writer.flush()
         savefiles = sorted(os.listdir("saves"), reverse = True)
         savegames = []
         for filename in savefiles:
             if not filename.endswith(".json"):
                 continue
             try:
-                with open(f"saves/{filename}", "r") as f:
-                    game = json.loads(f.read())
-                    savegames.append({"filename": filename, "data": game})
+                game = self.save_cache.get(f"saves/{filename}")
+                savegames.append({"filename": filename, "data": game})
             except Exception as e:
                 print(f"Error loading file '{filename}': {e}")
         return savegames
@@ -316,87 +462,135 @@ class Uno:
         :param filename: name of the savegame
         """
 
+        self.save_writer.flush()
         self.save_file_name = filename
-        with open(f"saves/{filename}", "r") as f:
-            game = json.loads(f.read())
-            if not "save_version" in game:
-                # convert save version from 0 to 1
-                self.game_version = 1
-                for ip, p in enumerate(game["players"]):
-                    cards = game["players"][ip]["score"]
-                    game["players"][ip].pop("score", None)
-                    game["players"][ip]["cards"] = cards
-                    game["players"][ip]["flashes"] = 0
-                    for ih, h in enumerate(p["history"]):
-                        game["players"][ip]["history"][ih] = {"action": "draw", "time": h[1], "value": h[0]}
-            elif game["save_version"] == 1:
-                # convert to game version 2 if necessary
-                # convert save version from 0 to 1
-                #game["save_version"] = 2
-                self.game_version = 2
-                for ip, p in enumerate(game["players"]):
-                    #cards = game["players"][ip]["score"]
-                    
-                    game["players"][ip]["wins"] = 0
-                    
-                    for ih, h in enumerate(p["history"]):
-                        action = h["action"]
-                        if h["action"] == "flash":
-                            action = "win"
-                        game["players"][ip]["history"][ih] = {"action": action, "time": h["time"], "value": h["value"]}
-                pass
-
-            self.players = game["players"]
-            self.ticks_start = get_ticks() - game["current_tick"]
-            self.pcount = len(self.players)
-            self.playerdata_changed(None)
-            self.setstate(1)
+        game = SaveJournal.read(f"saves/{filename}")
+        self.players = Player.from_save(game) # converts save version 0 and 1
+        for p in self.players:
+            if p.wins is None:
+                p.wins = 0 # version 0 and 1 saves stored no wins, the game screen counts them from now on
+        self.save_version = 2 # players are always saved in the current format
+        self.ticks_start = get_ticks() - game["current_tick"]
+        self.pcount = len(self.players)
+        self._build_action_log()
+        self.history_index = {p.num: HistoryIndex(p) for p in self.players}
+        self.game_id += 1
+        self._open_journal(game.get("journal_seq"))
+        self.playerdata_changed(None)
+        self.setstate(1)
     
     def save(self) -> None:
         """
         Save the current game
+        The savegame is written by the save writer thread, players are copied so they can change in the meantime
         """
         if self.save_file_name is None:
             return
         
         game = {
             "current_tick": self.get_game_time(), 
-            "players": self.players, 
-            "save_version": self.save_version
+            "players": [p.copy() for p in self.players], 
+            "save_version": self.save_version,
+            "journal_seq": self.journal.seq
         }
         
         if not os.path.isdir("saves"):
             os.mkdir("saves")
         
-        with open(f"saves/{self.save_file_name}", "w") as f:
-            f.write(json.dumps(game))
+        self.save_writer.write_snapshot(f"saves/{self.save_file_name}", game, self.journal.path)
+        self.journal.snapshot_written()
     
-    def playerdata_changed(self, p : dict, action : str = "draw") -> None:
+    def playerdata_changed(self, p : Player, action : str = "draw") -> None:
         """
         Appends a history entry and saves the game
+        :param p: player after the action
+        :param action: "draw" or "win"
         """
         if p is None:
             return
-
+        
+        self.redo_actions = []
+        self._add_history_entry(p, action)
+    
+    def _add_history_entry(self, p : Player, action : str) -> None:
+        """
+        Appends a history entry to the player and the global action log and saves the game
+        """
         if action == "draw":
-            value = p["cards"]
+            value = p.cards
         elif action == "win":
-            value = p["wins"]
+            value = p.wins
         else:
             return
 
-        p["history"].append({"action": action, "value": value, "time": self.get_game_time(), "timestamp": int(time())})
-        self.save()
+        action_time = self.get_game_time()
+        p.add_entry(action, value, action_time, int(time()))
+        self.history_index[p.num].append(action, value, action_time)
+        self.actions.append(p)
+        self._save_action({"op": "add", "num": p.num, "entry": p.get_entry(-1)}, p)
     
-    def get_player_by_name(self, name : str) -> dict:
+    def _build_action_log(self) -> None:
         """
-        Returns the player dictionary by name
+        Rebuilds the global action log from the player histories of a loaded game
         """
+        actions = []
         for p in self.players:
-            if p["name"] == name:
+            actions.extend((t, p) for t in p.times)
+        actions.sort(key=lambda a: a[0])
+        self.actions = [a[1] for a in actions]
+        self.redo_actions = []
+    
+    @staticmethod
+    def _get_action_key(action : str) -> str:
+        return "wins" if action == "win" else "cards"
+    
+    def _save_action(self, record : dict, p : Player) -> None:
+        """
+        Persists a single player action, either by appending it to the journal or by rewriting the savegame
+        :param record: journal record describing the action
+        :param p: player after the action
+        """
+        if self.save_file_name is None:
+            return
+        
+        if self.save_mode != "journal" or self.journal.needs_snapshot():
+            self.save()
+            return
+        
+        record["cards"] = p.cards
+        record["wins"] = p.wins
+        record["tick"] = self.get_game_time()
+        self.journal.append(record)
+    
+    def _open_journal(self, seq : Optional[int]) -> None:
+        """
+        Opens the journal of the current savegame
+        :param seq: journal sequence number stored in the savegame, None if it has to be snapshotted first
+        """
+        self.journal = SaveJournal(self.save_file_name, seq, JOURNAL_SNAPSHOT_INTERVAL, self.save_writer)
+    
+    def get_history_index(self, p : Player) -> HistoryIndex:
+        """
+        Returns the running totals of the players history
+        """
+        return self.history_index[p.num]
+    
+    def get_player_by_name(self, name : str) -> Player:
+        """
+        Returns the player by name
+        """
+        for p in self.players:
+            if p.name == name:
                 return p
         return None
     
+    def render_text(self, font : Font, text : str, color : tuple = WHITE, antialias : bool = True) -> Surface:
+        """
+        Render text through the text cache, for labels that are drawn every frame
+        The returned surface is shared and must not be drawn onto.
+        """
+        return self.text_cache.render(font, text, color, antialias)
+    
     def blit_aligned(self, src : Surface, dest : tuple, target : Surface = None, align : tuple = (2, 2)) -> None:
         (x, y) = dest
         if target is None:
@@ -416,26 +610,20 @@ class Uno:
 
     def exit(self) -> None:
         self.run = False
+        self.save_writer.close() # make sure every queued save is on disk
         pygame_quit()
         raise SystemExit()
 
     def _screen_resolution_changed(self) -> None:
-        global FONT_SM, FONT_MD, FONT_LG, FONT_XL
-        self.true_res = Uno._os_get_screen_resolution()
+        self.true_res = PLATFORM.get_screen_resolution()
         print(f"screen resolution is {self.true_res}")
         self.w, self.h = get_surface().get_size()
 
-        smaller_dim = min(self.w, self.h)
-        FONT_SM = SysFont('calibri', smaller_dim//40)
-        FONT_MD = SysFont('calibri', smaller_dim//30)
-        FONT_LG = SysFont('calibri', smaller_dim//20)
-        FONT_XL = SysFont('calibri', smaller_dim//10)
+        FONTS.set_reference_size(min(self.w, self.h)) # screens get their fonts through get_font
 
         self.bg = Surface((self.w, self.h))
-
-    @staticmethod
-    def _os_get_screen_resolution() -> tuple:
-        return (ctypes.windll.user32.GetSystemMetrics(0), ctypes.windll.user32.GetSystemMetrics(1) - 100)
+        self.dirty.resize((self.w, self.h))
+        self.text_cache.clear()
         
 
 